@@ -1,14 +1,16 @@
-from fastapi import FastAPI, Depends, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, FastAPI, Depends, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Dict, Any
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Any, Optional
 import models
 import uvicorn
-from database import SessionLocal, engine
+from database import SessionLocal, get_database_key, get_engine, get_settings, get_pool_stats
 from schemas import ProjectSchema, ProjectCreateSchema, TimelineItemSchema, ProjectTagSchema, ProjectIndividualSchema
-from utils.audit_utils import auto_populate_audit_fields, get_active_only_filter, soft_delete
-from utils.schema_manager import ensure_schema_exists
+from utils.audit_utils import auto_populate_audit_fields, get_active_only_filter
+from utils.schema_manager import bootstrap_schema
 from utils.smart_update import (
     compare_and_update_project_tags,
     compare_and_update_project_individuals,
@@ -16,18 +18,68 @@ from utils.smart_update import (
     has_project_fields_changed,
     update_project_fields
 )
+from utils import analytics_queries, analytics_snapshot
+from utils.audit_queries import (
+    MAX_AUDIT_PAGE_SIZE,
+    build_audit_log_statement,
+    decode_audit_cursor,
+    split_audit_page,
+    audit_log_to_dict
+)
+from utils.audit_archive import read_archived_audit_logs
+from utils.audit_replay import reconstruct_row
+from utils.bulk_sync import MAX_BATCH_SIZE, UNCHANGED, payload_to_item, soft_delete_projects, upsert_projects
+from utils.dimensions import (
+    MAX_LOOKUP_SIZE,
+    resolve_dimension_ids,
+    build_dimension_lookup_statement,
+    build_dimension_name_statement,
+    build_dimension_projects_statement,
+    shape_dimension_lookup,
+    shape_dimension_projects
+)
+from utils.conditional_requests import (
+    get_registry_version,
+    get_project_version,
+    make_etag,
+    get_validator_headers,
+    is_not_modified,
+    not_modified_response
+)
+from utils.project_export import NDJSON_MEDIA_TYPE, stream_projects_export
+from utils.timeline_dates import parse_timeline_date
+from utils.project_serializer import (
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    parse_fields,
+    build_project_listing_statement,
+    build_project_detail_statement,
+    split_page,
+    project_to_api_dict
+)
 import audit_logging
+import audit_pipeline
+import cache
 
-# Ensure the registry schema exists before creating tables
-SCHEMA_NAME = "registry"
-if ensure_schema_exists(engine, SCHEMA_NAME):
-    models.Base.metadata.create_all(bind=engine)
-    # Initialize audit logging
-    audit_logging.setup_audit_logging()
-else:
-    raise RuntimeError(f"Failed to ensure schema '{SCHEMA_NAME}' exists")
+# Initialize audit logging (session event hooks only, no database access)
+audit_logging.setup_audit_logging(get_settings().AUDIT_SNAPSHOT_MODE)
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema DDL runs once per worker start, not at import (SCHEMA_BOOTSTRAP_MODE)
+    settings = get_settings()
+    bootstrap_schema(
+        get_engine(),
+        settings.SCHEMA_BOOTSTRAP_MODE,
+        settings.SCHEMA_VERSION_FILE,
+        get_database_key(settings)
+    )
+    audit_pipeline.start_audit_writer(settings, SessionLocal)
+    yield
+    # Drain queued audit rows before the worker exits
+    audit_pipeline.stop_audit_writer()
+
+app = FastAPI(lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -36,71 +88,116 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Last-Modified"],
 )
 
+# Read-only endpoints, replaced by their async_routes counterparts in async mode
+read_router = APIRouter()
+
 def get_db():
     db = SessionLocal()
+    # Collect the request's audit rows and write them with its commit
+    audit_logging.begin_audit_buffer(db)
     try:
         yield db
     finally:
         db.close()
 
-@app.get("/projects")
-def read_api_projects(db: Session = Depends(get_db)):
-    projects = db.query(models.Project).filter(get_active_only_filter(models.Project)).all()
-    
-    # Transform to match frontend format
-    transformed_projects = []
-    for project in projects:
-        # Convert tags from relationship to simple list
-        tags = [tag.tag for tag in project.tags]
-        
-        # Convert individuals to match frontend format
-        individuals_involved = [individual.name for individual in project.individuals]
-        
-        # Convert timeline items to match frontend format
-        timeline = []
-        for item in project.timeline:
-            timeline.append({
-                "title": item.title,
-                "description": item.description,
-                "date": item.date,
-                "isStepActive": item.is_step_active
-            })
-        
-        # Create project dict matching frontend structure
-        project_dict = {
-            "id": project.id,
-            "title": project.title,
-            "description": project.description,
-            "status": project.status,
-            "tags": tags,
-            "whyWeBuiltThis": project.why_we_built_this or "",
-            "whatWeveBuilt": project.what_weve_built or "",
-            "individualsInvolved": individuals_involved,
-            "timeline": timeline,
-            "ntiStatus": project.nti_status or "",
-            "ntiLink": project.nti_link or "",
-            "primaryBenefitsCategory": project.primary_benefits_category or "",
-            "primaryAIBenefitCategory": project.primary_ai_benefit_category or "",
-            "investmentRequired": project.investment_required or "",
-            "expectedNearTermBenefits": project.expected_near_term_benefits or "",
-            "expectedLongTermBenefits": project.expected_long_term_benefits or "",
-            "primaryBusinessFunction": project.primary_business_function or ""
-        }
-        transformed_projects.append(project_dict)
-    
+@read_router.get("/projects")
+def read_api_projects(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    List active projects in frontend format.
+    
+    Pages are keyed on the project id: pass the `X-Next-Cursor` header of one page
+    as `cursor` to fetch the next. `fields` is a comma separated projection
+    (e.g. `fields=id,title,status,tags`) that limits both the SELECT and the JSON.
+    """
+    try:
+        field_names = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Conditional GET: answer from the registry version without loading anything
+    last_modified, active_count = get_registry_version(db)
+    etag = make_etag("projects", last_modified, active_count, ",".join(field_names), cursor, limit)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    response.headers.update(get_validator_headers(etag, last_modified))
+    
+    # Keyed on the version too, so writes made by other workers are never served stale
+    project_cache = cache.get_project_cache()
+    cache_key = (cache.LISTING_NAMESPACE, etag)
+    cached = project_cache.get(cache_key) if project_cache else None
+    if cached is not None:
+        if cached["nextCursor"] is not None:
+            response.headers[NEXT_CURSOR_HEADER] = cached["nextCursor"]
+        return cached["projects"]
+    
+    projects = db.execute(build_project_listing_statement(field_names, cursor, limit)).scalars().all()
+    projects, next_cursor = split_page(projects, limit)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    
+    transformed_projects = [project_to_api_dict(project, field_names) for project in projects]
+    if project_cache:
+        project_cache.set(cache_key, {"projects": transformed_projects, "nextCursor": next_cursor})
     return transformed_projects
 
-@app.get("/projects/{project_id}", response_model=ProjectSchema)
-def read_project(project_id: str, db: Session = Depends(get_db)):
-    project = db.query(models.Project).filter(
-        models.Project.id == project_id,
-        get_active_only_filter(models.Project)
-    ).first()
+@app.get("/projects/export")
+def export_projects(fields: Optional[str] = None, gzip: bool = False):
+    """
+    Stream every active project as NDJSON (one project per line, children nested).
+    
+    Projects are read in keyset pages, so memory use is independent of the registry
+    size. `fields` is the same projection as `/projects`; `gzip=true` compresses
+    the stream (Content-Encoding: gzip).
+    """
+    try:
+        field_names = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    headers = {"Content-Disposition": 'attachment; filename="projects.ndjson"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        stream_projects_export(SessionLocal, field_names, compress=gzip),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers=headers
+    )
+
+@read_router.get("/projects/{project_id}", response_model=ProjectSchema)
+def read_project(project_id: str, request: Request, db: Session = Depends(get_db)):
+    # Conditional GET on the project's updated_at (primary key lookup)
+    last_modified = get_project_version(db, project_id)
+    if last_modified is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    etag = make_etag("project", project_id, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    validator_headers = get_validator_headers(etag, last_modified)
+    
+    project_cache = cache.get_project_cache()
+    cache_key = (cache.PROJECT_NAMESPACE, project_id, last_modified)
+    cached = project_cache.get(cache_key) if project_cache else None
+    if cached is not None:
+        return JSONResponse(content=cached, headers=validator_headers)
+    
+    project = db.execute(build_project_detail_statement(project_id)).scalars().first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    return project
+    
+    payload = ProjectSchema.model_validate(project).model_dump(mode="json")
+    if project_cache:
+        project_cache.set(cache_key, payload)
+    return JSONResponse(content=payload, headers=validator_headers)
 
 @app.post("/projects", response_model=ProjectSchema)
 def create_project(project: ProjectCreateSchema, db: Session = Depends(get_db)):
@@ -122,51 +219,96 @@ def create_project(project: ProjectCreateSchema, db: Session = Depends(get_db)):
     )
     auto_populate_audit_fields(db_project, is_update=False)
     db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
     
-    # Add tags
+    # Children repeated in the payload are stored once, keyed like the smart update
+    # (and the analytics state) keys them, so a PUT of the same payload is a no-op
+    
+    # Add tags (linked to their tag ids, created as needed; first spelling wins)
+    db_children = []
+    tag_ids = resolve_dimension_ids(db, models.Tag, [tag_data.tag for tag_data in project.tags])
+    tag_names = {}
     for tag_data in project.tags:
-        db_tag = models.ProjectTag(project_id=db_project.id, tag=tag_data.tag)
+        tag_names.setdefault(tag_ids[tag_data.tag], tag_data.tag)
+    for tag_id, tag_name in tag_names.items():
+        db_tag = models.ProjectTag(project_id=db_project.id, tag_id=tag_id, tag=tag_name)
         auto_populate_audit_fields(db_tag, is_update=False)
-        db.add(db_tag)
+        db_children.append(db_tag)
     
-    # Add individuals
+    # Add individuals (linked to their person ids)
+    person_ids = resolve_dimension_ids(db, models.Person, [individual_data.name for individual_data in project.individuals])
+    individual_names = {}
     for individual_data in project.individuals:
-        db_individual = models.ProjectIndividual(project_id=db_project.id, name=individual_data.name)
+        individual_names.setdefault(person_ids[individual_data.name], individual_data.name)
+    for person_id, individual_name in individual_names.items():
+        db_individual = models.ProjectIndividual(
+            project_id=db_project.id,
+            person_id=person_id,
+            name=individual_name
+        )
         auto_populate_audit_fields(db_individual, is_update=False)
-        db.add(db_individual)
+        db_children.append(db_individual)
     
-    # Add timeline items
-    for timeline_data in project.timeline:
+    # Add timeline items (one per title + date, the last one wins)
+    timeline_items = {analytics_snapshot.timeline_key(item): item for item in project.timeline}
+    for timeline_data in timeline_items.values():
         db_timeline = models.TimelineItem(
             project_id=db_project.id,
             title=timeline_data.title,
             description=timeline_data.description,
             date=timeline_data.date,
+            date_value=parse_timeline_date(timeline_data.date),
             is_step_active=timeline_data.is_step_active
         )
         auto_populate_audit_fields(db_timeline, is_update=False)
-        db.add(db_timeline)
+        db_children.append(db_timeline)
     
-    db.commit()
-    db.refresh(db_project)
+    db.add_all(db_children)
+    # Flush to assign child IDs for the audit trail
+    db.flush()
     
-    # Log audit trail for project creation
+    # Log audit trail for project creation and related entities
     audit_logging.log_insert(db, db_project, context="new-project")
+    for child in db_children:
+        audit_logging.log_insert(db, child, context="new-project")
     
-    # Log audit trail for related entities
-    for tag in db_project.tags:
-        audit_logging.log_insert(db, tag, context="new-project")
-    
-    for individual in db_project.individuals:
-        audit_logging.log_insert(db, individual, context="new-project")
+    analytics_snapshot.apply_project_change(
+        db, None, analytics_snapshot.project_state_from_payload(project, db_project.id, tag_ids)
+    )
     
-    for timeline_item in db_project.timeline:
-        audit_logging.log_insert(db, timeline_item, context="new-project")
+    # Data and audit rows are committed together
+    db.commit()
+    cache.invalidate_project(db_project.id)
+    db.refresh(db_project)
     
     return db_project
 
+@app.post("/projects/batch")
+def batch_upsert_projects(projects: List[ProjectCreateSchema], db: Session = Depends(get_db)) -> List[Dict[str, str]]:
+    """
+    Create or update many projects in one transaction.
+    
+    Each payload is applied like POST (new id) or PUT (existing id, soft-deleted
+    ones are restored), but set-wise: existing rows for all ids are loaded with
+    one query per table and the inserts, updates and soft-deletes are bulk
+    statements. Returns a created/updated/unchanged result per item.
+    """
+    if len(projects) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_SIZE} projects per batch")
+    project_ids = [project.id for project in projects]
+    if len(set(project_ids)) != len(project_ids):
+        raise HTTPException(status_code=400, detail="Duplicate project ids in batch")
+    
+    items = {project.id: payload_to_item(project) for project in projects}
+    results, _ = upsert_projects(db, items, context="batch-update")
+    
+    # Data, audit rows and analytics deltas are committed together
+    db.commit()
+    for project_id, result in results.items():
+        if result != UNCHANGED:
+            cache.invalidate_project(project_id)
+    
+    return [{"id": project_id, "result": results[project_id]} for project_id in project_ids]
+
 @app.put("/projects/{project_id}", response_model=ProjectSchema)
 def update_project(project_id: str, project: ProjectCreateSchema, db: Session = Depends(get_db)):
     """Smart update that only changes what's actually different"""
@@ -178,6 +320,9 @@ def update_project(project_id: str, project: ProjectCreateSchema, db: Session =
         raise HTTPException(status_code=404, detail="Project not found")
     
     print(f"Smart update for project {project_id}")
+    snapshot_enabled = analytics_snapshot.is_snapshot_enabled()
+    if snapshot_enabled:
+        old_analytics_state = analytics_snapshot.project_state_from_model(db_project)
     
     # Check if main project fields have changed
     project_fields_changed = has_project_fields_changed(db_project, project)
@@ -199,198 +344,259 @@ def update_project(project_id: str, project: ProjectCreateSchema, db: Session =
     existing_timeline = db_project.timeline
     
     # Compare and update tags
-    compare_and_update_project_tags(db, project_id, project.tags, existing_tags)
+    tags_changed, tag_ids = compare_and_update_project_tags(db, project_id, project.tags, existing_tags)
     
     # Compare and update individuals
-    compare_and_update_project_individuals(db, project_id, project.individuals, existing_individuals)
+    individuals_changed = compare_and_update_project_individuals(db, project_id, project.individuals, existing_individuals)
     
     # Compare and update timeline items
-    compare_and_update_timeline_items(db, project_id, project.timeline, existing_timeline)
+    timeline_changed = compare_and_update_timeline_items(db, project_id, project.timeline, existing_timeline)
     
-    # Commit all changes
-    db.commit()
-    db.refresh(db_project)
+    # Child changes touch the project so its updated_at stays a valid version token
+    if not project_fields_changed and (tags_changed or individuals_changed or timeline_changed):
+        auto_populate_audit_fields(db_project, is_update=True)
     
     # Log audit trail only for main project changes
     if project_fields_changed:
         audit_logging.log_update(db, db_project, old_project_data, context="smart-update")
         print("Project update logged to audit trail")
     
+    if snapshot_enabled:
+        analytics_snapshot.apply_project_change(
+            db, old_analytics_state, analytics_snapshot.project_state_from_payload(project, project_id, tag_ids)
+        )
+    
+    # Commit all changes together with their audit rows
+    db.commit()
+    cache.invalidate_project(project_id)
+    db.refresh(db_project)
+    
     return db_project
 
 @app.delete("/projects/{project_id}")
 def delete_project(project_id: str, db: Session = Depends(get_db)):
-    """Soft delete a project by setting is_active to False"""
-    db_project = db.query(models.Project).filter(
-        models.Project.id == project_id,
-        get_active_only_filter(models.Project)
-    ).first()
-    if not db_project:
+    """Soft delete a project and its active children by setting is_active to False"""
+    # One UPDATE per table, with the audit rows and analytics deltas in the same transaction
+    if not soft_delete_projects(db, [project_id], context="soft-delete"):
         raise HTTPException(status_code=404, detail="Project not found")
     
-    # Log audit trail for deletions before soft deleting
-    audit_logging.log_delete(db, db_project, context="soft-delete")
-    
-    # Log deletions for related items before soft deleting
-    for tag in db_project.tags:
-        if tag.is_active:
-            audit_logging.log_delete(db, tag, context="soft-delete")
-    
-    for individual in db_project.individuals:
-        if individual.is_active:
-            audit_logging.log_delete(db, individual, context="soft-delete")
-    
-    for timeline_item in db_project.timeline:
-        if timeline_item.is_active:
-            audit_logging.log_delete(db, timeline_item, context="soft-delete")
-    
-    # Soft delete the project and all related items
-    soft_delete(db, db_project)
-    
-    # Also soft delete related items
-    for tag in db_project.tags:
-        if tag.is_active:
-            soft_delete(db, tag)
-    
-    for individual in db_project.individuals:
-        if individual.is_active:
-            soft_delete(db, individual)
-    
-    for timeline_item in db_project.timeline:
-        if timeline_item.is_active:
-            soft_delete(db, timeline_item)
+    db.commit()
+    cache.invalidate_project(project_id)
     
     return {"message": "Project deleted successfully"}
 
-@app.get("/analytics/overview")
-def get_analytics_overview(db: Session = Depends(get_db)) -> Dict[str, Any]:
+@read_router.get("/analytics/overview")
+def get_analytics_overview(request: Request, response: Response, db: Session = Depends(get_db)) -> Dict[str, Any]:
     """Get dashboard overview metrics"""
+    last_modified, active_count = get_registry_version(db)
+    etag = make_etag("analytics-overview", last_modified, active_count)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    response.headers.update(get_validator_headers(etag, last_modified))
+    
+    if analytics_snapshot.is_snapshot_enabled():
+        return analytics_snapshot.read_overview(db)
+    
+    grouped_statement, top_tags_statement = analytics_queries.build_overview_statements()
+    return analytics_queries.shape_overview(
+        db.execute(grouped_statement).all(),
+        db.execute(top_tags_statement).all()
+    )
+
+def read_dimension_projects(db: Session, name: str, dimension_id: int, not_found: str) -> Dict[str, Any]:
+    dimension_name = db.execute(build_dimension_name_statement(name, dimension_id)).scalar()
+    if dimension_name is None:
+        raise HTTPException(status_code=404, detail=not_found)
+    rows = db.execute(build_dimension_projects_statement(name, dimension_id)).all()
+    return shape_dimension_projects(dimension_id, dimension_name, rows)
+
+@read_router.get("/tags")
+def lookup_tags(
+    prefix: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_LOOKUP_SIZE),
+    db: Session = Depends(get_db)
+) -> List[Dict[str, Any]]:
+    """Look up tags by name prefix, with the number of active projects using each"""
+    return shape_dimension_lookup(db.execute(build_dimension_lookup_statement("tags", prefix, limit)).all())
+
+@read_router.get("/tags/{tag_id}/projects")
+def read_tag_projects(tag_id: int, db: Session = Depends(get_db)) -> Dict[str, Any]:
+    """Get the active projects with a tag"""
+    return read_dimension_projects(db, "tags", tag_id, "Tag not found")
+
+@read_router.get("/people")
+def lookup_people(
+    prefix: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_LOOKUP_SIZE),
+    db: Session = Depends(get_db)
+) -> List[Dict[str, Any]]:
+    """Look up individuals by name prefix, with the number of active projects they work on"""
+    return shape_dimension_lookup(db.execute(build_dimension_lookup_statement("individuals", prefix, limit)).all())
+
+@read_router.get("/people/{person_id}/projects")
+def read_person_projects(person_id: int, db: Session = Depends(get_db)) -> Dict[str, Any]:
+    """Get the active projects an individual has worked on"""
+    return read_dimension_projects(db, "individuals", person_id, "Person not found")
+
+@app.get("/audit/recent")
+def get_recent_audit_logs(
+    response: Response,
+    limit: int = Query(50, ge=1, le=MAX_AUDIT_PAGE_SIZE),
+    table_name: Optional[str] = None,
+    row_id: Optional[str] = None,
+    actor: Optional[str] = None,
+    action: Optional[str] = None,
+    context: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    include_data: bool = True,
+    include_archived: bool = False,
+    db: Session = Depends(get_db)
+) -> List[Dict[str, Any]]:
+    """
+    Get audit log entries, newest first.
+    
+    Filter by any of table_name/row_id/actor/action/context and the [since, until)
+    time range; page with the `X-Next-Cursor` header as `cursor`. Set
+    include_data=false to leave out the old_data/new_data snapshots, and
+    include_archived=true to continue into the archive once the table runs out.
+    """
+    try:
+        audit_cursor = decode_audit_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    filters = {
+        "table_name": table_name,
+        "row_id": row_id,
+        "actor": actor,
+        "action": action.upper() if action else None,
+        "context": context,
+    }
+    filters = {field: value for field, value in filters.items() if value is not None}
+    
+    statement = build_audit_log_statement(filters, since, until, audit_cursor, limit, include_data)
+    audit_logs = db.execute(statement).scalars().all()
+    if include_archived and len(audit_logs) <= limit:
+        # Archived rows are all older than the table's, so the page continues there
+        items = [audit_log_to_dict(log, include_data) for log in audit_logs]
+        archive_cursor = (audit_logs[-1].timestamp, audit_logs[-1].id) if audit_logs else audit_cursor
+        archived, next_cursor = read_archived_audit_logs(
+            get_settings().AUDIT_ARCHIVE_DIR,
+            filters,
+            since,
+            until,
+            archive_cursor,
+            limit - len(audit_logs),
+            include_data
+        )
+        items.extend(archived)
+    else:
+        audit_logs, next_cursor = split_audit_page(audit_logs, limit)
+        items = [audit_log_to_dict(log, include_data) for log in audit_logs]
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
-    # Total projects count (active only)
-    total_projects = db.query(models.Project).filter(get_active_only_filter(models.Project)).count()
-    
-    # Projects by status (active only)
-    projects_by_status = db.query(
-        models.Project.status, 
-        func.count(models.Project.id).label('count')
-    ).filter(get_active_only_filter(models.Project)).group_by(models.Project.status).all()
-    
-    # Projects by business function (active only)
-    projects_by_function = db.query(
-        models.Project.primary_business_function, 
-        func.count(models.Project.id).label('count')
-    ).filter(
-        models.Project.primary_business_function.isnot(None),
-        get_active_only_filter(models.Project)
-    ).group_by(
-        models.Project.primary_business_function
-    ).all()
-    
-    # Projects by benefits category (active only)
-    projects_by_benefits = db.query(
-        models.Project.primary_benefits_category, 
-        func.count(models.Project.id).label('count')
-    ).filter(
-        models.Project.primary_benefits_category.isnot(None),
-        get_active_only_filter(models.Project)
-    ).group_by(
-        models.Project.primary_benefits_category
-    ).all()
-    
-    # Projects by AI benefit category (active only)
-    projects_by_ai_benefits = db.query(
-        models.Project.primary_ai_benefit_category, 
-        func.count(models.Project.id).label('count')
-    ).filter(
-        models.Project.primary_ai_benefit_category.isnot(None),
-        get_active_only_filter(models.Project)
-    ).group_by(
-        models.Project.primary_ai_benefit_category
-    ).all()
-    
-    # Count active timeline items (from active projects only)
-    active_milestones = db.query(models.TimelineItem).join(models.Project).filter(
-        models.TimelineItem.is_step_active == True,
-        get_active_only_filter(models.TimelineItem),
-        get_active_only_filter(models.Project)
-    ).count()
-    
-    # Most used tags (from active projects only)
-    top_tags = db.query(
-        models.ProjectTag.tag, 
-        func.count(models.ProjectTag.tag).label('count')
-    ).join(models.Project).filter(
-        get_active_only_filter(models.ProjectTag),
-        get_active_only_filter(models.Project)
-    ).group_by(models.ProjectTag.tag).order_by(
-        func.count(models.ProjectTag.tag).desc()
-    ).limit(10).all()
-    
+    return items
+
+@app.get("/audit/reconstruct")
+def reconstruct_audited_row(
+    table_name: str,
+    row_id: str,
+    at: Optional[datetime] = None,
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """Rebuild a row's state at a point in time (default: now) by replaying its audit log and archive"""
+    state = reconstruct_row(db, table_name, row_id, at, get_settings().AUDIT_ARCHIVE_DIR)
+    if state is None:
+        raise HTTPException(status_code=404, detail="No audit history for this row at that time")
     return {
-        "totalProjects": total_projects,
-        "activeMilestones": active_milestones,
-        "projectsByStatus": [{"status": row.status, "count": row.count} for row in projects_by_status],
-        "projectsByFunction": [{"function": row.primary_business_function, "count": row.count} for row in projects_by_function],
-        "projectsByBenefits": [{"category": row.primary_benefits_category, "count": row.count} for row in projects_by_benefits],
-        "projectsByAIBenefits": [{"category": row.primary_ai_benefit_category, "count": row.count} for row in projects_by_ai_benefits],
-        "topTags": [{"tag": row.tag, "count": row.count} for row in top_tags]
+        "table_name": table_name,
+        "row_id": row_id,
+        "at": at.isoformat() if at else None,
+        "state": state
     }
 
-@app.get("/audit/recent")
-def get_recent_audit_logs(limit: int = 50, db: Session = Depends(get_db)) -> List[Dict[str, Any]]:
-    """Get recent audit log entries"""
-    audit_logs = db.query(models.AuditLog).order_by(
-        models.AuditLog.timestamp.desc()
-    ).limit(limit).all()
-    
-    return [
-        {
-            "id": log.id,
-            "table_name": log.table_name,
-            "row_id": log.row_id,
-            "action": log.action,
-            "context": log.context,
-            "timestamp": log.timestamp.isoformat(),
-            "actor": log.actor,
-            "old_data": log.old_data,
-            "new_data": log.new_data
-        }
-        for log in audit_logs
-    ]
+def get_async_pool_stats() -> Optional[Dict[str, Any]]:
+    if not get_settings().DB_ASYNC_ENABLED:
+        return None
+    from async_database import get_async_engine
+    return get_pool_stats(get_async_engine().sync_engine)
+
+@app.get("/metrics")
+def get_metrics() -> Dict[str, Any]:
+    """Get in-process runtime counters"""
+    return {
+        "auditPipeline": audit_pipeline.get_audit_writer_stats(),
+        "projectCache": cache.get_cache_stats(),
+        "dbPool": get_pool_stats(get_engine()),
+        "asyncDbPool": get_async_pool_stats()
+    }
 
-@app.get("/analytics/timeline")
-def get_timeline_analytics(db: Session = Depends(get_db)) -> Dict[str, Any]:
+@read_router.get("/analytics/timeline")
+def get_timeline_analytics(request: Request, response: Response, db: Session = Depends(get_db)) -> Dict[str, Any]:
     """Get timeline and progress analytics"""
+    last_modified, active_count = get_registry_version(db)
+    etag = make_etag("analytics-timeline", last_modified, active_count)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    response.headers.update(get_validator_headers(etag, last_modified))
     
-    # Timeline items grouped by month (active only)
-    timeline_items = db.query(models.TimelineItem).join(models.Project).filter(
-        get_active_only_filter(models.TimelineItem),
-        get_active_only_filter(models.Project)
-    ).all()
-    
-    # Group timeline items by project and status (active projects only)
-    project_progress = []
-    projects = db.query(models.Project).filter(get_active_only_filter(models.Project)).all()
-    
-    for project in projects:
-        total_items = len(project.timeline)
-        active_items = sum(1 for item in project.timeline if item.is_step_active)
-        completed_items = total_items - active_items
-        
-        project_progress.append({
-            "projectId": project.id,
-            "projectTitle": project.title,
-            "status": project.status,
-            "totalMilestones": total_items,
-            "activeMilestones": active_items,
-            "completedMilestones": completed_items,
-            "progressPercentage": (completed_items / total_items * 100) if total_items > 0 else 0
-        })
+    if analytics_snapshot.is_snapshot_enabled():
+        return analytics_snapshot.read_timeline(db)
     
-    return {
-        "projectProgress": project_progress,
-        "totalTimelineItems": len(timeline_items)
-    }
+    return analytics_queries.shape_timeline(
+        db.execute(analytics_queries.build_timeline_progress_statement()).all()
+    )
+
+@read_router.get("/analytics/milestones/monthly")
+def get_milestones_per_month(
+    request: Request,
+    response: Response,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """Get milestone counts per month of their parsed dates, optionally within [since, until)"""
+    last_modified, active_count = get_registry_version(db)
+    etag = make_etag("analytics-milestones-monthly", last_modified, active_count, since, until)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    response.headers.update(get_validator_headers(etag, last_modified))
+    
+    return analytics_queries.shape_milestones_per_month(
+        db.execute(analytics_queries.build_milestones_per_month_statement(since, until)).all()
+    )
+
+@read_router.get("/analytics/milestones/upcoming")
+def get_upcoming_milestones(
+    request: Request,
+    response: Response,
+    days: int = Query(90, ge=1, le=3660),
+    limit: int = Query(50, ge=1, le=analytics_queries.MAX_UPCOMING_MILESTONES),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """Get the milestones dated within the next `days` days (from today, UTC), soonest first"""
+    start = datetime.utcnow().date()
+    end = start + timedelta(days=days)
+    # The window moves with the date, so only the ETag (which includes it) validates
+    last_modified, active_count = get_registry_version(db)
+    etag = make_etag("analytics-milestones-upcoming", last_modified, active_count, start, days, limit)
+    if is_not_modified(request, etag, None):
+        return not_modified_response(etag, None)
+    response.headers.update(get_validator_headers(etag, None))
+    
+    return analytics_queries.shape_upcoming_milestones(
+        start, end, db.execute(analytics_queries.build_upcoming_milestones_statement(start, end, limit)).all()
+    )
+
+# Read endpoints run on the async engine when DB_ASYNC_ENABLED is set
+if get_settings().DB_ASYNC_ENABLED:
+    import async_routes
+    app.include_router(async_routes.router)
+else:
+    app.include_router(read_router)
     
 if __name__ == '__main__':
     uvicorn.run(
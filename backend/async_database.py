@@ -0,0 +1,38 @@
+# async_database.py
+from functools import lru_cache
+from urllib.parse import quote_plus
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from database import get_settings, get_pool_options, InstrumentedAsyncAdaptedQueuePool
+from utils.model_serializer import encode_json
+
+
+@lru_cache()
+def get_async_engine() -> AsyncEngine:
+    s = get_settings()
+    pwd = quote_plus(s.SQL_SERVER_PWD)
+    driver = quote_plus(s.SQL_SERVER_ODBC_DRIVER)
+    # Like the pymssql engine, connect without enforcing certificate validation
+    url = (
+        f"mssql+aioodbc://{s.SQL_SERVER_USER}:{pwd}"
+        f"@{s.SQL_SERVER_HOST}:{s.SQL_SERVER_PORT}"
+        f"/{s.SQL_SERVER_DB}"
+        f"?driver={driver}&TrustServerCertificate=yes"
+    )
+    return create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        json_serializer=encode_json,
+        **get_pool_options(s)
+    )
+
+
+@lru_cache()
+def get_async_sessionmaker() -> async_sessionmaker:
+    return async_sessionmaker(bind=get_async_engine(), autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
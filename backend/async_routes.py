@@ -0,0 +1,234 @@
+from datetime import date, datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Dict, Any, Optional
+from async_database import get_async_db
+from schemas import ProjectSchema
+from utils import analytics_queries, analytics_snapshot
+from utils.dimensions import (
+    MAX_LOOKUP_SIZE,
+    build_dimension_lookup_statement,
+    build_dimension_name_statement,
+    build_dimension_projects_statement,
+    shape_dimension_lookup,
+    shape_dimension_projects
+)
+from utils.conditional_requests import (
+    build_registry_version_statement,
+    build_project_version_statement,
+    to_registry_version,
+    make_etag,
+    get_validator_headers,
+    is_not_modified,
+    not_modified_response
+)
+from utils.project_serializer import (
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    parse_fields,
+    build_project_listing_statement,
+    build_project_detail_statement,
+    split_page,
+    project_to_api_dict
+)
+import cache
+
+# Async counterparts of app.read_router, used when DB_ASYNC_ENABLED is set.
+# They run the same statements; every relationship is eager-loaded, so no lazy
+# load (which AsyncSession cannot do) is ever triggered.
+router = APIRouter()
+
+
+async def get_registry_version(db: AsyncSession):
+    return to_registry_version((await db.execute(build_registry_version_statement())).one())
+
+
+@router.get("/projects")
+async def read_api_projects(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """List active projects in frontend format (see app.read_api_projects)"""
+    try:
+        field_names = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    last_modified, active_count = await get_registry_version(db)
+    etag = make_etag("projects", last_modified, active_count, ",".join(field_names), cursor, limit)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    response.headers.update(get_validator_headers(etag, last_modified))
+    
+    project_cache = cache.get_project_cache()
+    cache_key = (cache.LISTING_NAMESPACE, etag)
+    cached = project_cache.get(cache_key) if project_cache else None
+    if cached is not None:
+        if cached["nextCursor"] is not None:
+            response.headers[NEXT_CURSOR_HEADER] = cached["nextCursor"]
+        return cached["projects"]
+    
+    result = await db.execute(build_project_listing_statement(field_names, cursor, limit))
+    projects, next_cursor = split_page(result.scalars().all(), limit)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    
+    transformed_projects = [project_to_api_dict(project, field_names) for project in projects]
+    if project_cache:
+        project_cache.set(cache_key, {"projects": transformed_projects, "nextCursor": next_cursor})
+    return transformed_projects
+
+
+@router.get("/projects/{project_id}", response_model=ProjectSchema)
+async def read_project(project_id: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    last_modified = (await db.execute(build_project_version_statement(project_id))).scalar()
+    if last_modified is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    etag = make_etag("project", project_id, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    validator_headers = get_validator_headers(etag, last_modified)
+    
+    project_cache = cache.get_project_cache()
+    cache_key = (cache.PROJECT_NAMESPACE, project_id, last_modified)
+    cached = project_cache.get(cache_key) if project_cache else None
+    if cached is not None:
+        return JSONResponse(content=cached, headers=validator_headers)
+    
+    project = (await db.execute(build_project_detail_statement(project_id))).scalars().first()
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    payload = ProjectSchema.model_validate(project).model_dump(mode="json")
+    if project_cache:
+        project_cache.set(cache_key, payload)
+    return JSONResponse(content=payload, headers=validator_headers)
+
+
+@router.get("/analytics/overview")
+async def get_analytics_overview(request: Request, response: Response, db: AsyncSession = Depends(get_async_db)) -> Dict[str, Any]:
+    """Get dashboard overview metrics"""
+    last_modified, active_count = await get_registry_version(db)
+    etag = make_etag("analytics-overview", last_modified, active_count)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    response.headers.update(get_validator_headers(etag, last_modified))
+    
+    if analytics_snapshot.is_snapshot_enabled():
+        counters_statement, top_tags_statement = analytics_snapshot.build_overview_statements()
+        return analytics_snapshot.shape_overview(
+            (await db.execute(counters_statement)).scalars().all(),
+            (await db.execute(top_tags_statement)).all()
+        )
+    
+    grouped_statement, top_tags_statement = analytics_queries.build_overview_statements()
+    return analytics_queries.shape_overview(
+        (await db.execute(grouped_statement)).all(),
+        (await db.execute(top_tags_statement)).all()
+    )
+
+
+@router.get("/analytics/timeline")
+async def get_timeline_analytics(request: Request, response: Response, db: AsyncSession = Depends(get_async_db)) -> Dict[str, Any]:
+    """Get timeline and progress analytics"""
+    last_modified, active_count = await get_registry_version(db)
+    etag = make_etag("analytics-timeline", last_modified, active_count)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    response.headers.update(get_validator_headers(etag, last_modified))
+    
+    if analytics_snapshot.is_snapshot_enabled():
+        summaries = (await db.execute(analytics_snapshot.build_timeline_statement())).scalars().all()
+        return analytics_snapshot.shape_timeline(summaries)
+    
+    return analytics_queries.shape_timeline(
+        (await db.execute(analytics_queries.build_timeline_progress_statement())).all()
+    )
+
+
+
+@router.get("/analytics/milestones/monthly")
+async def get_milestones_per_month(
+    request: Request,
+    response: Response,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db)
+) -> Dict[str, Any]:
+    """Get milestone counts per month of their parsed dates, optionally within [since, until)"""
+    last_modified, active_count = await get_registry_version(db)
+    etag = make_etag("analytics-milestones-monthly", last_modified, active_count, since, until)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    response.headers.update(get_validator_headers(etag, last_modified))
+    
+    result = await db.execute(analytics_queries.build_milestones_per_month_statement(since, until))
+    return analytics_queries.shape_milestones_per_month(result.all())
+
+
+@router.get("/analytics/milestones/upcoming")
+async def get_upcoming_milestones(
+    request: Request,
+    response: Response,
+    days: int = Query(90, ge=1, le=3660),
+    limit: int = Query(50, ge=1, le=analytics_queries.MAX_UPCOMING_MILESTONES),
+    db: AsyncSession = Depends(get_async_db)
+) -> Dict[str, Any]:
+    """Get the milestones dated within the next `days` days (from today, UTC), soonest first"""
+    start = datetime.utcnow().date()
+    end = start + timedelta(days=days)
+    last_modified, active_count = await get_registry_version(db)
+    etag = make_etag("analytics-milestones-upcoming", last_modified, active_count, start, days, limit)
+    if is_not_modified(request, etag, None):
+        return not_modified_response(etag, None)
+    response.headers.update(get_validator_headers(etag, None))
+    
+    result = await db.execute(analytics_queries.build_upcoming_milestones_statement(start, end, limit))
+    return analytics_queries.shape_upcoming_milestones(start, end, result.all())
+
+
+async def read_dimension_projects(db: AsyncSession, name: str, dimension_id: int, not_found: str) -> Dict[str, Any]:
+    dimension_name = (await db.execute(build_dimension_name_statement(name, dimension_id))).scalar()
+    if dimension_name is None:
+        raise HTTPException(status_code=404, detail=not_found)
+    rows = (await db.execute(build_dimension_projects_statement(name, dimension_id))).all()
+    return shape_dimension_projects(dimension_id, dimension_name, rows)
+
+
+@router.get("/tags")
+async def lookup_tags(
+    prefix: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_LOOKUP_SIZE),
+    db: AsyncSession = Depends(get_async_db)
+) -> List[Dict[str, Any]]:
+    """Look up tags by name prefix, with the number of active projects using each"""
+    result = await db.execute(build_dimension_lookup_statement("tags", prefix, limit))
+    return shape_dimension_lookup(result.all())
+
+
+@router.get("/tags/{tag_id}/projects")
+async def read_tag_projects(tag_id: int, db: AsyncSession = Depends(get_async_db)) -> Dict[str, Any]:
+    """Get the active projects with a tag"""
+    return await read_dimension_projects(db, "tags", tag_id, "Tag not found")
+
+
+@router.get("/people")
+async def lookup_people(
+    prefix: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_LOOKUP_SIZE),
+    db: AsyncSession = Depends(get_async_db)
+) -> List[Dict[str, Any]]:
+    """Look up individuals by name prefix, with the number of active projects they work on"""
+    result = await db.execute(build_dimension_lookup_statement("individuals", prefix, limit))
+    return shape_dimension_lookup(result.all())
+
+
+@router.get("/people/{person_id}/projects")
+async def read_person_projects(person_id: int, db: AsyncSession = Depends(get_async_db)) -> Dict[str, Any]:
+    """Get the active projects an individual has worked on"""
+    return await read_dimension_projects(db, "individuals", person_id, "Person not found")
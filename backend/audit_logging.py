@@ -1,33 +1,154 @@
-from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+from datetime import date, datetime, time, timezone
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import event, insert
 from sqlalchemy.orm import Session
-from sqlalchemy.inspection import inspect
 from models import AuditLog
+from utils.model_serializer import get_model_serializer, serialize_instance
 
+# Key under which a session's pending audit rows are kept in Session.info
+AUDIT_BUFFER_KEY = "audit_buffer"
 
-def setup_audit_logging():
+# Background writer that takes committed audit rows off the request path (async mode)
+_audit_writer: Optional[Any] = None
+
+# "full" stores complete before/after snapshots for updates, "diff" only the changed columns
+SNAPSHOT_MODES = ("full", "diff")
+_snapshot_mode = "full"
+
+
+class AuditBuffer:
+    """Collects the audit rows of one unit of work so they can be written in one bulk insert"""
+
+    def __init__(self):
+        self.rows: List[Dict[str, Any]] = []
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self.rows.append(row)
+
+    def drain(self) -> List[Dict[str, Any]]:
+        rows, self.rows = self.rows, []
+        return rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+def setup_audit_logging(snapshot_mode: str = "full"):
     """Initialize audit logging system"""
-    pass
+    global _snapshot_mode
+    if snapshot_mode not in SNAPSHOT_MODES:
+        raise ValueError(f"Unknown audit snapshot mode '{snapshot_mode}'")
+    _snapshot_mode = snapshot_mode
+    
+    # Buffered audit rows are written as part of the transaction they describe
+    if not event.contains(Session, "before_commit", _flush_buffer_before_commit):
+        event.listen(Session, "before_commit", _flush_buffer_before_commit)
+        event.listen(Session, "after_commit", _submit_buffer_after_commit)
+        event.listen(Session, "after_rollback", _discard_buffer_after_rollback)
 
 
-def serialize_object(obj: Any) -> Dict[str, Any]:
-    """Convert SQLAlchemy object to dictionary for JSON storage"""
-    if obj is None:
-        return None
+def set_audit_writer(writer: Optional[Any]) -> None:
+    """
+    Hand buffered audit rows to a background writer after commit instead of inserting them.
+    
+    Args:
+        writer: Object with a `submit(rows)` method, or None to write synchronously again
+    """
+    global _audit_writer
+    _audit_writer = writer
+
+
+def begin_audit_buffer(db: Session) -> AuditBuffer:
+    """
+    Buffer audit rows logged through this session instead of committing each one.
+    
+    The buffered rows are bulk inserted right before the session's next commit, so
+    they succeed or fail together with the data change, and are discarded on rollback.
+    
+    Args:
+        db: SQLAlchemy session
+        
+    Returns:
+        The session's audit buffer
+    """
+    buffer = db.info.get(AUDIT_BUFFER_KEY)
+    if buffer is None:
+        buffer = AuditBuffer()
+        db.info[AUDIT_BUFFER_KEY] = buffer
+    return buffer
+
+
+def get_audit_buffer(db: Session) -> Optional[AuditBuffer]:
+    """Get the session's audit buffer, or None if audit rows are committed immediately"""
+    return db.info.get(AUDIT_BUFFER_KEY)
+
+
+def flush_audit_buffer(db: Session) -> int:
+    """
+    Write all buffered audit rows with a single executemany INSERT.
     
-    # Get the mapper for the object to access column properties
-    mapper = inspect(obj.__class__)
-    data = {}
+    Args:
+        db: SQLAlchemy session
+        
+    Returns:
+        Number of audit rows written
+    """
+    buffer = get_audit_buffer(db)
+    if not buffer:
+        return 0
     
-    for column in mapper.columns:
-        value = getattr(obj, column.key)
-        # Handle datetime objects
-        if isinstance(value, datetime):
-            data[column.key] = value.isoformat()
-        else:
-            data[column.key] = value
+    rows = buffer.drain()
+    db.execute(insert(AuditLog), rows)
+    return len(rows)
+
+
+def _flush_buffer_before_commit(session: Session) -> None:
+    # In async mode rows are only handed off once the data change has committed
+    if _audit_writer is None:
+        flush_audit_buffer(session)
+
+
+def _submit_buffer_after_commit(session: Session) -> None:
+    buffer = get_audit_buffer(session)
+    if _audit_writer is not None and buffer:
+        _audit_writer.submit(buffer.drain())
+
+
+def _discard_buffer_after_rollback(session: Session) -> None:
+    buffer = get_audit_buffer(session)
+    if buffer:
+        buffer.drain()
+
+
+def serialize_object(obj: Any) -> Dict[str, Any]:
+    """Convert SQLAlchemy object to dictionary for JSON storage"""
+    # Column keys, getters and datetime converters are precomputed per model
+    return serialize_instance(obj)
+
+
+def serialize_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a column -> value mapping (e.g. a bulk statement row) for JSON storage"""
+    return {
+        key: value.isoformat() if isinstance(value, (datetime, date, time)) else value
+        for key, value in row.items()
+    }
+
+
+def diff_snapshots(
+    old_data: Dict[str, Any],
+    new_data: Dict[str, Any]
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Reduce two snapshots to the columns whose values differ.
     
-    return data
+    Returns:
+        (old values, new values) of the changed columns only
+    """
+    changed = [key for key in new_data if old_data.get(key) != new_data[key]]
+    return (
+        {key: old_data.get(key) for key in changed},
+        {key: new_data[key] for key in changed}
+    )
 
 
 def log_audit_change(
@@ -52,18 +173,24 @@ def log_audit_change(
         new_data: JSON snapshot after the change (for INSERT/UPDATE)
         actor: Who performed the action (defaults to "system")
     """
-    audit_log = AuditLog(
-        table_name=table_name,
-        row_id=str(row_id),
-        action=action.upper(),
-        old_data=old_data,
-        new_data=new_data,
-        timestamp=datetime.now(timezone.utc),
-        actor=actor,
-        context=context
-    )
+    audit_row = {
+        "table_name": table_name,
+        "row_id": str(row_id),
+        "action": action.upper(),
+        "old_data": old_data,
+        "new_data": new_data,
+        "timestamp": datetime.now(timezone.utc),
+        "actor": actor,
+        "context": context
+    }
+    
+    # Inside a buffered unit of work the row is written with the next commit
+    buffer = get_audit_buffer(db)
+    if buffer is not None:
+        buffer.add(audit_row)
+        return
     
-    db.add(audit_log)
+    db.add(AuditLog(**audit_row))
     db.commit()
 
 
@@ -113,16 +240,47 @@ def log_update(
         old_obj_data: Dictionary containing the old object data before update
         actor: Who performed the action
     """
-    table_name = obj.__tablename__
-    row_id = get_primary_key_value(obj)
-    new_data = serialize_object(obj)
+    log_row_update(
+        db=db,
+        table_name=obj.__tablename__,
+        row_id=get_primary_key_value(obj),
+        old_data=old_obj_data,
+        new_data=serialize_object(obj),
+        actor=actor,
+        context=context
+    )
+
+
+def log_row_update(
+    db: Session,
+    table_name: str,
+    row_id: str,
+    old_data: Optional[Dict[str, Any]],
+    new_data: Dict[str, Any],
+    actor: str = "system",
+    context: Optional[str] = None
+) -> None:
+    """
+    Log an UPDATE from row snapshots, for changes made with bulk statements.
+    
+    Args:
+        db: SQLAlchemy session
+        table_name: Name of the affected table
+        row_id: Primary key of the changed row
+        old_data: Snapshot before the update
+        new_data: Snapshot after the update
+        actor: Who performed the action
+    """
+    # INSERT/DELETE keep full snapshots as replay baselines; updates can be compacted
+    if _snapshot_mode == "diff" and old_data is not None:
+        old_data, new_data = diff_snapshots(old_data, new_data)
     
     log_audit_change(
         db=db,
         table_name=table_name,
         row_id=row_id,
         action="UPDATE",
-        old_data=old_obj_data,
+        old_data=old_data,
         new_data=new_data,
         actor=actor,
         context=context
@@ -167,18 +325,6 @@ def get_primary_key_value(obj: Any) -> str:
         obj: SQLAlchemy object
         
     Returns:
-        Primary key value as string
-    """
-    mapper = inspect(obj.__class__)
-    primary_key_columns = mapper.primary_key
-    
-    if len(primary_key_columns) == 1:
-        # Single primary key
-        pk_column = primary_key_columns[0]
-        return str(getattr(obj, pk_column.key))
-    else:
-        # Composite primary key - concatenate with separator
-        pk_values = []
-        for pk_column in primary_key_columns:
-            pk_values.append(str(getattr(obj, pk_column.key)))
-        return "|".join(pk_values)
\ No newline at end of file
+        Primary key value as string (composite keys joined with "|")
+    """
+    return get_model_serializer(type(obj)).primary_key(obj)
@@ -0,0 +1,252 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from models import AuditLog
+import audit_logging
+
+logger = logging.getLogger(__name__)
+
+BACKPRESSURE_POLICIES = ("block", "drop", "spill")
+
+_writer: Optional["AsyncAuditWriter"] = None
+
+
+class AsyncAuditWriter:
+    """
+    Background writer that drains committed audit rows into the audit_log table.
+    
+    Request threads only enqueue rows; a single worker thread writes them in batches
+    of up to `flush_size` rows, or whatever has arrived after `flush_interval` seconds.
+    When the bounded queue is full the backpressure policy decides what happens:
+    "block" waits for room, "drop" discards the row and counts it, and "spill"
+    appends it to a local JSON-lines file that is replayed on the next start.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        queue_size: int = 10000,
+        flush_size: int = 500,
+        flush_interval: float = 1.0,
+        backpressure: str = "block",
+        spill_path: str = "audit_spill.jsonl"
+    ):
+        if backpressure not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unknown audit backpressure policy '{backpressure}'")
+        
+        self.session_factory = session_factory
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.backpressure = backpressure
+        self.spill_path = spill_path
+        
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=queue_size)
+        self._stopping = threading.Event()
+        self._spill_lock = threading.Lock()
+        # Counters are bumped from request threads and the worker thread
+        self._counters_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._counters = {
+            "enqueued": 0,
+            "written": 0,
+            "dropped": 0,
+            "spilled": 0,
+            "replayed": 0,
+            "batches": 0,
+            "failedBatches": 0,
+        }
+
+    def start(self) -> None:
+        """Start the worker thread, replaying rows spilled by a previous run first"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting new work and wait until every queued row has been written"""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.error("Audit writer did not drain within %s seconds", timeout)
+            return
+        self._thread = None
+
+    def submit(self, rows: List[Dict[str, Any]]) -> None:
+        """Enqueue committed audit rows, applying the backpressure policy when the queue is full"""
+        for row in rows:
+            if self.backpressure == "block":
+                self._queue.put(row)
+            else:
+                try:
+                    self._queue.put_nowait(row)
+                except queue.Full:
+                    if self.backpressure == "drop":
+                        self._count("dropped")
+                        continue
+                    self._spill([row])
+                    continue
+            self._count("enqueued")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get queue depth and lifetime counters"""
+        return {
+            "mode": "async",
+            "backpressure": self.backpressure,
+            "queued": self._queue.qsize(),
+            "queueSize": self._queue.maxsize,
+            "running": self._thread is not None and self._thread.is_alive(),
+            **self._counters_snapshot(),
+        }
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._counters_lock:
+            self._counters[counter] += amount
+
+    def _counters_snapshot(self) -> Dict[str, int]:
+        with self._counters_lock:
+            return dict(self._counters)
+
+    def _run(self) -> None:
+        self._replay_spill_file()
+        while not (self._stopping.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
+
+    def _next_batch(self) -> List[Dict[str, Any]]:
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.flush_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+            # On shutdown take whatever is queued without waiting for the interval
+            if self._stopping.is_set():
+                deadline = time.monotonic()
+        return batch
+
+    def _write(self, batch: List[Dict[str, Any]]) -> bool:
+        """Write one batch; returns False if it failed and was spilled instead"""
+        db = self.session_factory()
+        try:
+            db.execute(insert(AuditLog), batch)
+            db.commit()
+            self._count("written", len(batch))
+            self._count("batches")
+            return True
+        except Exception as e:
+            # Never lose committed audit rows: keep them on disk for the next start
+            db.rollback()
+            logger.error(f"Error writing {len(batch)} audit rows, spilling to '{self.spill_path}': {e}")
+            self._count("failedBatches")
+            self._spill(batch)
+            return False
+        finally:
+            db.close()
+
+    def _spill(self, rows: List[Dict[str, Any]]) -> None:
+        with self._spill_lock:
+            with open(self.spill_path, "a", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps(row, default=_encode_datetime) + "\n")
+        self._count("spilled", len(rows))
+
+    def _replay_spill_file(self) -> None:
+        if not os.path.exists(self.spill_path):
+            return
+        
+        # Move the file aside so rows spilled during replay start a fresh file
+        replay_path = f"{self.spill_path}.replay"
+        with self._spill_lock:
+            os.replace(self.spill_path, replay_path)
+        
+        batch = []
+        replayed = 0
+        with open(replay_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                row["timestamp"] = datetime.fromisoformat(row["timestamp"])
+                batch.append(row)
+                if len(batch) >= self.flush_size:
+                    # Failed batches are spilled again, not replayed
+                    if self._write(batch):
+                        replayed += len(batch)
+                    batch = []
+        if batch and self._write(batch):
+            replayed += len(batch)
+        os.remove(replay_path)
+        self._count("replayed", replayed)
+        logger.info(f"Replayed {replayed} spilled audit rows")
+
+
+def _encode_datetime(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def start_audit_writer(settings: Any, session_factory: Callable[[], Session]) -> Optional[AsyncAuditWriter]:
+    """
+    Start the background audit writer when AUDIT_MODE is "async".
+    
+    Args:
+        settings: Application settings
+        session_factory: Factory for the writer's own sessions
+        
+    Returns:
+        The running writer, or None in the default synchronous mode
+    """
+    global _writer
+    if settings.AUDIT_MODE != "async":
+        return None
+    if _writer is not None:
+        return _writer
+    
+    _writer = AsyncAuditWriter(
+        session_factory,
+        queue_size=settings.AUDIT_QUEUE_SIZE,
+        flush_size=settings.AUDIT_FLUSH_SIZE,
+        flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+        backpressure=settings.AUDIT_BACKPRESSURE,
+        spill_path=settings.AUDIT_SPILL_PATH,
+    )
+    _writer.start()
+    audit_logging.set_audit_writer(_writer)
+    # Also drain when the process exits without a clean lifespan shutdown
+    atexit.register(stop_audit_writer)
+    logger.info("Asynchronous audit writer started")
+    return _writer
+
+
+def stop_audit_writer() -> None:
+    """Detach the background writer and block until its queue is drained"""
+    global _writer
+    if _writer is None:
+        return
+    audit_logging.set_audit_writer(None)
+    _writer.stop()
+    _writer = None
+
+
+def get_audit_writer_stats() -> Dict[str, Any]:
+    """Get the background writer's counters, or the synchronous mode marker"""
+    if _writer is None:
+        return {"mode": "sync"}
+    return _writer.stats()
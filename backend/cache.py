@@ -0,0 +1,120 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple, Hashable
+from database import get_settings
+
+# Key namespaces
+PROJECT_NAMESPACE = "project"
+LISTING_NAMESPACE = "projects"
+
+
+class PayloadCache:
+    """
+    Thread-safe in-process cache of JSON-serializable payloads.
+    
+    Entries expire after `ttl_seconds` and the least recently used ones are evicted
+    once the JSON-encoded size of all entries exceeds `max_bytes`. Keys are tuples that
+    start with a namespace, so related entries can be invalidated together by prefix.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Tuple[Any, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[Any]:
+        """Get a cached payload, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            value, size, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self._counters["expirations"] += 1
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return value
+
+    def set(self, key: Tuple[Hashable, ...], value: Any) -> None:
+        """Cache a payload, evicting least recently used entries to stay within the byte bound"""
+        size = len(json.dumps(value, default=str).encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, time.monotonic() + self.ttl_seconds)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self._counters["evictions"] += 1
+
+    def invalidate_prefix(self, *prefix: Hashable) -> None:
+        """Drop every entry whose key starts with the given elements"""
+        with self._lock:
+            for key in [key for key in self._entries if key[:len(prefix)] == prefix]:
+                self._remove(key)
+                self._counters["invalidations"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get size and lifetime counters"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "maxBytes": self.max_bytes,
+                "ttlSeconds": self.ttl_seconds,
+                **self._counters,
+            }
+
+    def _remove(self, key: Tuple[Hashable, ...]) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+
+@lru_cache()
+def get_project_cache() -> Optional[PayloadCache]:
+    """Get the process-wide project payload cache, or None when caching is disabled"""
+    s = get_settings()
+    if not s.PROJECT_CACHE_ENABLED:
+        return None
+    return PayloadCache(max_bytes=s.PROJECT_CACHE_MAX_BYTES, ttl_seconds=s.PROJECT_CACHE_TTL_SECONDS)
+
+
+def invalidate_project(project_id: str) -> None:
+    """Drop a project's cached payload and every cached listing (call after commit)"""
+    cache = get_project_cache()
+    if cache is None:
+        return
+    cache.invalidate_prefix(PROJECT_NAMESPACE, project_id)
+    cache.invalidate_prefix(LISTING_NAMESPACE)
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Get the project cache counters, or a disabled marker"""
+    cache = get_project_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
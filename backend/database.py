@@ -1,11 +1,18 @@
 # database.py
+import threading
+import time
 from functools import lru_cache
+from typing import Dict, Any
 from urllib.parse import quote_plus
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from dotenv import load_dotenv
+from utils.model_serializer import encode_json
 import os
 
 class Settings(BaseSettings):
@@ -15,6 +22,50 @@ class Settings(BaseSettings):
     SQL_SERVER_USER: str 
     SQL_SERVER_PWD: str
 
+    # Schema bootstrap at startup: "auto" applies pending migrations on every start,
+    # "versioned" only when the database isn't at the migration head (one query when
+    # SCHEMA_VERSION_FILE records it), "skip" never touches DDL (run utils/migrate.py instead)
+    SCHEMA_BOOTSTRAP_MODE: str = "auto"
+    SCHEMA_VERSION_FILE: str = ".schema_version"
+
+    # Connection pool (one pool per worker process)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Give forked worker processes their own pool instead of sharing the parent's sockets
+    DB_POOL_FORK_SAFE: bool = True
+
+    # Serve the read and analytics endpoints from an asyncio engine (aioodbc)
+    DB_ASYNC_ENABLED: bool = False
+    SQL_SERVER_ODBC_DRIVER: str = "ODBC Driver 18 for SQL Server"
+
+    # Audit logging: "sync" writes audit rows with the request's commit,
+    # "async" hands them to a background writer after commit
+    AUDIT_MODE: str = "sync"
+    AUDIT_QUEUE_SIZE: int = 10000
+    AUDIT_FLUSH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_BACKPRESSURE: str = "block"  # block, drop or spill
+    AUDIT_SPILL_PATH: str = "audit_spill.jsonl"
+    # "full" before/after snapshots for updates, or "diff" with only the changed columns
+    AUDIT_SNAPSHOT_MODE: str = "full"
+    # Retention (utils/archive_audit_log.py): rows older than AUDIT_RETENTION_DAYS, or beyond
+    # the newest AUDIT_RETENTION_MAX_ROWS, move to gzip JSON-lines segments (0 disables a policy)
+    AUDIT_RETENTION_DAYS: int = 90
+    AUDIT_RETENTION_MAX_ROWS: int = 0
+    AUDIT_ARCHIVE_DIR: str = "audit_archive"
+    AUDIT_ARCHIVE_BATCH_SIZE: int = 1000
+
+    # Serve /analytics/* from counters maintained on write (run utils/rebuild_analytics.py first)
+    ANALYTICS_SNAPSHOT_ENABLED: bool = False
+
+    # In-process cache of serialized project payloads (per worker process)
+    PROJECT_CACHE_ENABLED: bool = True
+    PROJECT_CACHE_TTL_SECONDS: float = 30.0
+    PROJECT_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -26,7 +77,94 @@ def get_settings() -> Settings:
 
 load_dotenv(os.path.join(os.path.dirname(__file__), ".env"))
 
-def get_engine():
+
+class PoolMetrics:
+    """Counters for connection checkouts: how many, how long they waited, how many timed out"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record_checkout(self, wait_seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkoutTimeouts": self.timeouts,
+                "avgCheckoutMs": (self.total_wait_seconds / self.checkouts * 1000) if self.checkouts else 0.0,
+                "maxCheckoutMs": self.max_wait_seconds * 1000,
+            }
+
+
+class CheckoutTimingMixin:
+    """Pool mixin that records checkout latency (including pre-ping) and pool timeouts"""
+    metrics: PoolMetrics
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedQueuePool(CheckoutTimingMixin, QueuePool):
+    metrics = PoolMetrics()
+
+
+class InstrumentedAsyncAdaptedQueuePool(CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    metrics = PoolMetrics()
+
+
+def get_pool_options(s: Settings) -> Dict[str, Any]:
+    """Get the create_engine pool arguments shared by the sync and async engines"""
+    return {
+        "pool_size": s.DB_POOL_SIZE,
+        "max_overflow": s.DB_MAX_OVERFLOW,
+        "pool_timeout": s.DB_POOL_TIMEOUT_SECONDS,
+        # Recycle before SQL Server/firewalls drop idle connections; pre-ping catches the rest
+        "pool_recycle": s.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": s.DB_POOL_PRE_PING,
+    }
+
+
+def get_pool_stats(engine: Engine) -> Dict[str, Any]:
+    """Get the current pool occupancy together with the checkout counters"""
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checkedIn": pool.checkedin(),
+        "inUse": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "maxOverflow": pool._max_overflow,
+        "pid": os.getpid(),
+        **pool.metrics.snapshot(),
+    }
+
+
+def get_database_key(s: Settings) -> str:
+    """Identify the target database (e.g. for the schema version file)"""
+    return f"{s.SQL_SERVER_HOST}:{s.SQL_SERVER_PORT}/{s.SQL_SERVER_DB}"
+
+
+@lru_cache()
+def get_engine() -> Engine:
+    """Create the engine on first use, so importing this module opens nothing"""
     s = get_settings()
     pwd = quote_plus(s.SQL_SERVER_PWD)
     # pymssql does not accept Encrypt/TrustServerCertificate here
@@ -35,10 +173,36 @@ def get_engine():
         f"@{s.SQL_SERVER_HOST}:{s.SQL_SERVER_PORT}"
         f"/{s.SQL_SERVER_DB}"
     )
-    return create_engine(url)
+    engine = create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        json_serializer=encode_json,
+        **get_pool_options(s)
+    )
+    if s.DB_POOL_FORK_SAFE and hasattr(os, "register_at_fork"):
+        # A forked worker must not reuse the parent's connections; close=False leaves
+        # them open for the parent and gives the child a fresh, empty pool
+        os.register_at_fork(after_in_child=lambda: engine.dispose(close=False))
+    return engine
+
+
+def __getattr__(name: str) -> Any:
+    # `from database import engine` keeps working, but builds the engine lazily
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class LazySessionmaker(sessionmaker):
+    """sessionmaker that binds to get_engine() when the first session is made"""
+
+    def __call__(self, **local_kw: Any) -> Any:
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
 
-engine = get_engine()
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = LazySessionmaker(autocommit=False, autoflush=False)
 
 def get_db():
     db = SessionLocal()
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, Boolean, ForeignKey, Text, DateTime, JSON
+from sqlalchemy import Column, String, Integer, Boolean, ForeignKey, Text, Date, DateTime, JSON, Index
 from sqlalchemy.orm import relationship, declarative_base
 
 Base = declarative_base()
@@ -22,7 +22,16 @@ class AuditMixin:
 
 class Project(Base, AuditMixin):
     __tablename__ = "projects"
-    __table_args__ = {"schema": "registry"}
+    __table_args__ = (
+        # MAX(updated_at) is the registry version used for conditional GETs
+        Index("ix_projects_updated_at", "updated_at"),
+        # Active-only filters and the analytics breakdowns
+        Index("ix_projects_is_active_status", "is_active", "status"),
+        Index("ix_projects_is_active_business_function", "is_active", "primary_business_function"),
+        Index("ix_projects_is_active_benefits_category", "is_active", "primary_benefits_category"),
+        Index("ix_projects_is_active_ai_benefit_category", "is_active", "primary_ai_benefit_category"),
+        {"schema": "registry"},
+    )
 
     # use a 36-char UUID rather than VARCHAR(max)
     id = Column(String(GUID_LENGTH), primary_key=True, default=gen_uuid)
@@ -42,39 +51,76 @@ class Project(Base, AuditMixin):
     expected_long_term_benefits = Column(String(255))
     primary_business_function = Column(String(100))
 
-    # relationships
+    # relationships (ordered by insertion so eager and lazy loads agree)
     timeline = relationship(
-        "TimelineItem", back_populates="project", cascade="all, delete-orphan"
+        "TimelineItem", back_populates="project", cascade="all, delete-orphan",
+        order_by="TimelineItem.id"
     )
     tags = relationship(
-        "ProjectTag", back_populates="project", cascade="all, delete-orphan"
+        "ProjectTag", back_populates="project", cascade="all, delete-orphan",
+        order_by="ProjectTag.id"
     )
     individuals = relationship(
-        "ProjectIndividual", back_populates="project", cascade="all, delete-orphan"
+        "ProjectIndividual", back_populates="project", cascade="all, delete-orphan",
+        order_by="ProjectIndividual.id"
     )
 
 
 class TimelineItem(Base, AuditMixin):
     __tablename__ = "timeline_items"
-    __table_args__ = {"schema": "registry"}
+    __table_args__ = (
+        Index("ix_timeline_items_project_id_is_active", "project_id", "is_active"),
+        # Date range filters and month buckets over active milestones
+        Index("ix_timeline_items_is_active_date_value", "is_active", "date_value"),
+        {"schema": "registry"},
+    )
 
     # simple int PK so no VARCHAR(max) problems
     id = Column(Integer, primary_key=True, autoincrement=True)
     project_id = Column(String(GUID_LENGTH), ForeignKey("registry.projects.id"), nullable=False)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=False)
-    date = Column(String(50), nullable=False)
+    date = Column(String(50), nullable=False)  # as entered, for display
+    # Parsed from `date` (utils/timeline_dates.py); NULL when it isn't recognised
+    date_value = Column(Date, nullable=True)
     is_step_active = Column(Boolean, default=False)
 
     project = relationship("Project", back_populates="timeline")
 
 
+class Tag(Base):
+    """Deduplicated tag names; project_tags link to them by id"""
+    __tablename__ = "tags"
+    __table_args__ = {"schema": "registry"}
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(50), nullable=False, unique=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class Person(Base):
+    """Deduplicated individual names; project_individuals link to them by id"""
+    __tablename__ = "people"
+    __table_args__ = {"schema": "registry"}
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(100), nullable=False, unique=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
 class ProjectTag(Base, AuditMixin):
     __tablename__ = "project_tags"
-    __table_args__ = {"schema": "registry"}
+    __table_args__ = (
+        Index("ix_project_tags_project_id_is_active", "project_id", "is_active"),
+        # Tag aggregations and "projects with this tag" seek on the integer key
+        Index("ix_project_tags_tag_id_is_active", "tag_id", "is_active", "project_id"),
+        {"schema": "registry"},
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     project_id = Column(String(GUID_LENGTH), ForeignKey("registry.projects.id"), nullable=False)
+    # tag_id identifies the tag; the string is kept as entered, for display
+    tag_id = Column(Integer, ForeignKey("registry.tags.id"), nullable=True)
     tag = Column(String(50), nullable=False)
 
     project = relationship("Project", back_populates="tags")
@@ -82,10 +128,16 @@ class ProjectTag(Base, AuditMixin):
 
 class ProjectIndividual(Base, AuditMixin):
     __tablename__ = "project_individuals"
-    __table_args__ = {"schema": "registry"}
+    __table_args__ = (
+        Index("ix_project_individuals_project_id_is_active", "project_id", "is_active"),
+        Index("ix_project_individuals_person_id_is_active", "person_id", "is_active", "project_id"),
+        {"schema": "registry"},
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     project_id = Column(String(GUID_LENGTH), ForeignKey("registry.projects.id"), nullable=False)
+    # person_id identifies the individual; the string is kept as entered, for display
+    person_id = Column(Integer, ForeignKey("registry.people.id"), nullable=True)
     name = Column(String(100), nullable=False)
 
     project = relationship("Project", back_populates="individuals")
@@ -93,7 +145,17 @@ class ProjectIndividual(Base, AuditMixin):
 
 class AuditLog(Base):
     __tablename__ = "audit_log"
-    __table_args__ = {"schema": "registry"}
+    __table_args__ = (
+        Index("ix_audit_log_timestamp", "timestamp"),
+        Index("ix_audit_log_table_name_row_id", "table_name", "row_id"),
+        # Filtered, newest-first audit queries
+        Index("ix_audit_log_table_name_timestamp", "table_name", "timestamp"),
+        Index("ix_audit_log_actor_timestamp", "actor", "timestamp"),
+        Index("ix_audit_log_action_timestamp", "action", "timestamp"),
+        Index("ix_audit_log_context_timestamp", "context", "timestamp"),
+        Index("ix_audit_log_row_id_timestamp", "row_id", "timestamp"),
+        {"schema": "registry"},
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     table_name = Column(String(100), nullable=False)
@@ -104,3 +166,26 @@ class AuditLog(Base):
     timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
     actor = Column(String(100), default="system", nullable=False)
     context = Column(String(255), nullable=True)  # Additional context like "replace-all", "user-update"
+
+
+
+class AnalyticsCounter(Base):
+    """Maintained count of active projects per analytics dimension value"""
+    __tablename__ = "analytics_counters"
+    __table_args__ = {"schema": "registry"}
+
+    dimension = Column(String(50), primary_key=True)  # status, business_function, tag, total, ...
+    value = Column(String(100), primary_key=True)
+    count = Column(Integer, default=0, nullable=False)
+
+
+class ProjectMilestoneSummary(Base):
+    """Maintained per-project milestone counts for the timeline analytics"""
+    __tablename__ = "project_milestone_summary"
+    __table_args__ = {"schema": "registry"}
+
+    project_id = Column(String(GUID_LENGTH), ForeignKey("registry.projects.id"), primary_key=True)
+    project_title = Column(String(255), nullable=False)
+    status = Column(String(50), nullable=False)
+    total_milestones = Column(Integer, default=0, nullable=False)
+    active_milestones = Column(Integer, default=0, nullable=False)
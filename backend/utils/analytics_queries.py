@@ -0,0 +1,247 @@
+from datetime import date
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from sqlalchemy import and_, case, extract, func, select, tuple_
+from sqlalchemy.sql import Select
+import models
+from utils.audit_utils import get_active_only_filter
+
+# Overview breakdown label -> Project column
+OVERVIEW_DIMENSIONS = {
+    "status": models.Project.status,
+    "business_function": models.Project.primary_business_function,
+    "benefits_category": models.Project.primary_benefits_category,
+    "ai_benefit_category": models.Project.primary_ai_benefit_category,
+}
+
+# Largest page of /analytics/milestones/upcoming
+MAX_UPCOMING_MILESTONES = 500
+
+
+def build_overview_statements() -> Tuple[Select, Select]:
+    """
+    Build the two statements behind /analytics/overview.
+    
+    Returns:
+        (grouped, top_tags): one GROUPING SETS scan of the active projects, where each
+        grouping set yields the rows of one breakdown and () yields the totals, and the
+        most used tags
+    """
+    # Active milestones per project, joined onto the project scan
+    active_milestones_per_project = select(
+        models.TimelineItem.project_id,
+        func.count(models.TimelineItem.id).label('milestones')
+    ).where(
+        models.TimelineItem.is_step_active == True,
+        get_active_only_filter(models.TimelineItem)
+    ).group_by(models.TimelineItem.project_id).subquery()
+    
+    grouped = select(
+        *[column.label(name) for name, column in OVERVIEW_DIMENSIONS.items()],
+        *[func.grouping(column).label(f"grouping_{name}") for name, column in OVERVIEW_DIMENSIONS.items()],
+        func.count(models.Project.id).label('count'),
+        func.coalesce(func.sum(active_milestones_per_project.c.milestones), 0).label('milestones')
+    ).outerjoin(
+        active_milestones_per_project,
+        active_milestones_per_project.c.project_id == models.Project.id
+    ).where(
+        get_active_only_filter(models.Project)
+    ).group_by(
+        func.grouping_sets(*OVERVIEW_DIMENSIONS.values(), tuple_())
+    )
+    
+    # Most used tags (from active projects only), counted on the integer tag id and
+    # joined to the tag names afterwards
+    tag_count = func.count(models.ProjectTag.id)
+    tag_counts = select(
+        models.ProjectTag.tag_id,
+        tag_count.label('count')
+    ).join(models.Project).where(
+        get_active_only_filter(models.ProjectTag),
+        get_active_only_filter(models.Project)
+    ).group_by(models.ProjectTag.tag_id).order_by(
+        tag_count.desc()
+    ).limit(10).subquery()
+    top_tags = select(
+        models.Tag.name.label('tag'),
+        tag_counts.c.count
+    ).join(
+        tag_counts, tag_counts.c.tag_id == models.Tag.id
+    ).order_by(tag_counts.c.count.desc(), models.Tag.name)
+    
+    return grouped, top_tags
+
+
+def shape_overview(grouped_rows: Sequence[Any], top_tag_rows: Sequence[Any]) -> Dict[str, Any]:
+    """Build the /analytics/overview response from the rows of build_overview_statements"""
+    total_projects = 0
+    active_milestones = 0
+    breakdowns = {name: [] for name in OVERVIEW_DIMENSIONS}
+    for row in grouped_rows:
+        grouped_by = [name for name in OVERVIEW_DIMENSIONS if getattr(row, f"grouping_{name}") == 0]
+        if not grouped_by:
+            total_projects = row.count
+            active_milestones = row.milestones
+            continue
+        name = grouped_by[0]
+        # Projects without a function/category are left out of its breakdown
+        if getattr(row, name) is not None:
+            breakdowns[name].append(row)
+    
+    return {
+        "totalProjects": total_projects,
+        "activeMilestones": active_milestones,
+        "projectsByStatus": [{"status": row.status, "count": row.count} for row in breakdowns["status"]],
+        "projectsByFunction": [{"function": row.business_function, "count": row.count} for row in breakdowns["business_function"]],
+        "projectsByBenefits": [{"category": row.benefits_category, "count": row.count} for row in breakdowns["benefits_category"]],
+        "projectsByAIBenefits": [{"category": row.ai_benefit_category, "count": row.count} for row in breakdowns["ai_benefit_category"]],
+        "topTags": [{"tag": row.tag, "count": row.count} for row in top_tag_rows]
+    }
+
+
+def build_timeline_progress_statement() -> Select:
+    """Build the per-project milestone counts (active projects and timeline items only)"""
+    total_items = func.count(models.TimelineItem.id)
+    active_items = func.coalesce(func.sum(
+        case((models.TimelineItem.is_step_active == True, 1), else_=0)
+    ), 0)
+    return select(
+        models.Project.id,
+        models.Project.title,
+        models.Project.status,
+        total_items.label('total_items'),
+        active_items.label('active_items'),
+        case(
+            (total_items > 0, (total_items - active_items) * 100.0 / total_items),
+            else_=0
+        ).label('progress_percentage')
+    ).outerjoin(
+        models.TimelineItem,
+        and_(
+            models.TimelineItem.project_id == models.Project.id,
+            get_active_only_filter(models.TimelineItem)
+        )
+    ).where(
+        get_active_only_filter(models.Project)
+    ).group_by(
+        models.Project.id,
+        models.Project.title,
+        models.Project.status
+    )
+
+
+def shape_timeline(progress_rows: Sequence[Any]) -> Dict[str, Any]:
+    """Build the /analytics/timeline response from the rows of build_timeline_progress_statement"""
+    project_progress: List[Dict[str, Any]] = [
+        {
+            "projectId": row.id,
+            "projectTitle": row.title,
+            "status": row.status,
+            "totalMilestones": row.total_items,
+            "activeMilestones": row.active_items,
+            "completedMilestones": row.total_items - row.active_items,
+            "progressPercentage": float(row.progress_percentage)
+        }
+        for row in progress_rows
+    ]
+    
+    return {
+        "projectProgress": project_progress,
+        "totalTimelineItems": sum(row.total_items for row in progress_rows)
+    }
+
+
+def _dated_milestone_filters(since: Optional[date], until: Optional[date]) -> List[Any]:
+    """Active, dated items of active projects within [since, until) (a seek on the date index)"""
+    filters = [
+        get_active_only_filter(models.TimelineItem),
+        get_active_only_filter(models.Project),
+        models.TimelineItem.date_value.is_not(None),
+    ]
+    if since is not None:
+        filters.append(models.TimelineItem.date_value >= since)
+    if until is not None:
+        filters.append(models.TimelineItem.date_value < until)
+    return filters
+
+
+def build_milestones_per_month_statement(since: Optional[date], until: Optional[date]) -> Select:
+    """Build the milestone counts per calendar month of the parsed timeline dates"""
+    year = extract("year", models.TimelineItem.date_value)
+    month = extract("month", models.TimelineItem.date_value)
+    return select(
+        year.label('year'),
+        month.label('month'),
+        func.count(models.TimelineItem.id).label('milestones'),
+        func.coalesce(func.sum(
+            case((models.TimelineItem.is_step_active == True, 1), else_=0)
+        ), 0).label('active_milestones'),
+        func.count(func.distinct(models.TimelineItem.project_id)).label('projects')
+    ).join(
+        models.Project, models.Project.id == models.TimelineItem.project_id
+    ).where(
+        *_dated_milestone_filters(since, until)
+    ).group_by(year, month).order_by(year, month)
+
+
+def shape_milestones_per_month(rows: Sequence[Any]) -> Dict[str, Any]:
+    """
+    Build the /analytics/milestones/monthly response from the rows of
+    build_milestones_per_month_statement, with empty months in between filled in.
+    """
+    counts = {(int(row.year), int(row.month)): row for row in rows}
+    months: List[Dict[str, Any]] = []
+    if counts:
+        (year, month), last = min(counts), max(counts)
+        while (year, month) <= last:
+            row = counts.get((year, month))
+            milestones = row.milestones if row else 0
+            active_milestones = int(row.active_milestones) if row else 0
+            months.append({
+                "month": f"{year:04d}-{month:02d}",
+                "milestones": milestones,
+                "activeMilestones": active_milestones,
+                "completedMilestones": milestones - active_milestones,
+                "projects": row.projects if row else 0
+            })
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return {
+        "months": months,
+        "totalMilestones": sum(month["milestones"] for month in months)
+    }
+
+
+def build_upcoming_milestones_statement(start: date, end: date, limit: int) -> Select:
+    """Build the list of milestones dated within [start, end), soonest first"""
+    return select(
+        models.TimelineItem.project_id,
+        models.Project.title.label('project_title'),
+        models.TimelineItem.title,
+        models.TimelineItem.date,
+        models.TimelineItem.date_value,
+        models.TimelineItem.is_step_active
+    ).join(
+        models.Project, models.Project.id == models.TimelineItem.project_id
+    ).where(
+        *_dated_milestone_filters(start, end)
+    ).order_by(
+        models.TimelineItem.date_value, models.TimelineItem.id
+    ).limit(limit)
+
+
+def shape_upcoming_milestones(start: date, end: date, rows: Sequence[Any]) -> Dict[str, Any]:
+    """Build the /analytics/milestones/upcoming response from the rows of build_upcoming_milestones_statement"""
+    return {
+        "from": start.isoformat(),
+        "until": end.isoformat(),
+        "milestones": [
+            {
+                "projectId": row.project_id,
+                "projectTitle": row.project_title,
+                "title": row.title,
+                "date": row.date,
+                "dateValue": row.date_value.isoformat(),
+                "isStepActive": row.is_step_active
+            }
+            for row in rows
+        ]
+    }
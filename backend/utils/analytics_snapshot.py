@@ -0,0 +1,372 @@
+from collections import Counter
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence, Set, Tuple
+from sqlalchemy import String, and_, bindparam, cast, delete, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+import models
+from database import get_settings
+from utils.audit_utils import get_active_only_filter, get_active_children_options
+
+# Counter dimension -> project attribute
+PROJECT_DIMENSIONS = {
+    "status": "status",
+    "business_function": "primary_business_function",
+    "benefits_category": "primary_benefits_category",
+    "ai_benefit_category": "primary_ai_benefit_category",
+}
+TAG_DIMENSION = "tag"
+TOTAL_DIMENSION = "total"
+
+# Projects are loaded in pages when rebuilding
+REBUILD_PAGE_SIZE = 500
+
+# Keys per lookup/delete statement (SQL Server allows 2100 parameters)
+KEY_BATCH_SIZE = 1000
+
+
+def is_snapshot_enabled() -> bool:
+    """Check whether the analytics snapshot is maintained and served"""
+    return get_settings().ANALYTICS_SNAPSHOT_ENABLED
+
+
+def timeline_key(item: Any) -> str:
+    """Key identifying a timeline item within a project (same as smart_update)"""
+    return f"{item.title}|{item.date}"
+
+
+def project_state_from_model(project: models.Project) -> Dict[str, Any]:
+    """Capture the analytics-relevant state of a stored project and its active children"""
+    timeline = {timeline_key(item): item for item in project.timeline if item.is_active}
+    state = {attribute: getattr(project, attribute) for attribute in PROJECT_DIMENSIONS.values()}
+    state.update({
+        "id": project.id,
+        "title": project.title,
+        "tags": {tag.tag_id for tag in project.tags if tag.is_active},
+        "total_milestones": len(timeline),
+        "active_milestones": sum(1 for item in timeline.values() if item.is_step_active),
+    })
+    return state
+
+
+def project_state_from_payload(payload: Any, project_id: str, tag_ids: Dict[str, int]) -> Dict[str, Any]:
+    """
+    Capture the analytics-relevant state a project will have after applying a create/update payload.
+    
+    The id comes from the caller (e.g. the PUT path), not the payload body, and tags
+    are counted by the ids resolve_dimension_ids gave their names. Repeated children
+    count once, as create_project and the smart update store them once.
+    """
+    timeline = {timeline_key(item): item for item in payload.timeline}
+    state = {attribute: getattr(payload, attribute) for attribute in PROJECT_DIMENSIONS.values()}
+    state.update({
+        "id": project_id,
+        "title": payload.title,
+        "tags": {tag_ids[tag.tag] for tag in payload.tags},
+        "total_milestones": len(timeline),
+        "active_milestones": sum(1 for item in timeline.values() if item.is_step_active),
+    })
+    return state
+
+
+def project_state_from_rows(
+    project: Dict[str, Any],
+    tags: Iterable[Dict[str, Any]],
+    timeline: Iterable[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Capture the analytics-relevant state of a project given as column dicts (bulk writes)"""
+    timeline_items = {f"{item['title']}|{item['date']}": item for item in timeline}
+    state = {attribute: project.get(attribute) for attribute in PROJECT_DIMENSIONS.values()}
+    state.update({
+        "id": project["id"],
+        "title": project["title"],
+        "tags": {tag["tag_id"] for tag in tags},
+        "total_milestones": len(timeline_items),
+        "active_milestones": sum(1 for item in timeline_items.values() if item["is_step_active"]),
+    })
+    return state
+
+
+def get_counter_contributions(state: Optional[Dict[str, Any]]) -> Counter:
+    """Get the (dimension, value) counts a single active project contributes"""
+    contributions = Counter()
+    if state is None:
+        return contributions
+    
+    contributions[(TOTAL_DIMENSION, "projects")] += 1
+    contributions[(TOTAL_DIMENSION, "active_milestones")] += state["active_milestones"]
+    for dimension, attribute in PROJECT_DIMENSIONS.items():
+        if state[attribute] is not None:
+            contributions[(dimension, state[attribute])] += 1
+    # Tag counters are keyed on the tag id, so spellings of one tag share a counter
+    for tag_id in state["tags"]:
+        contributions[(TAG_DIMENSION, str(tag_id))] += 1
+    return contributions
+
+
+def _batches(items: Sequence[Any], size: int = KEY_BATCH_SIZE) -> Iterator[Sequence[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _load_existing_counter_keys(db: Session, keys: Sequence[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+    """
+    Find which (dimension, value) counters exist, in batches. SQL Server has no
+    row-value IN, so each batch is one value IN list per dimension, OR-ed together.
+    """
+    existing = set()
+    for batch in _batches(keys):
+        values_by_dimension: Dict[str, List[str]] = {}
+        for dimension, value in batch:
+            values_by_dimension.setdefault(dimension, []).append(value)
+        rows = db.execute(
+            select(models.AnalyticsCounter.dimension, models.AnalyticsCounter.value).where(or_(*[
+                and_(models.AnalyticsCounter.dimension == dimension, models.AnalyticsCounter.value.in_(values))
+                for dimension, values in values_by_dimension.items()
+            ]))
+        )
+        existing.update((row.dimension, row.value) for row in rows)
+    return existing
+
+
+def apply_counter_deltas(db: Session, deltas: Dict[Tuple[str, str], int]) -> None:
+    """
+    Add deltas to the analytics counters: a batched SELECT for the affected keys,
+    one executemany UPDATE for existing counters and one INSERT for new ones.
+    
+    The INSERT runs in a savepoint. If a concurrent write created one of the new
+    counters first, it is rolled back and those deltas are applied again, now as
+    updates of the existing counters.
+    
+    Args:
+        db: SQLAlchemy session
+        deltas: Count change per (dimension, value)
+    """
+    pending = {key: delta for key, delta in deltas.items() if delta}
+    while pending:
+        existing_keys = _load_existing_counter_keys(db, list(pending))
+        
+        updates = [
+            {"b_dimension": dimension, "b_value": value, "delta": delta}
+            for (dimension, value), delta in pending.items() if (dimension, value) in existing_keys
+        ]
+        inserts = [
+            {"dimension": dimension, "value": value, "count": delta}
+            for (dimension, value), delta in pending.items() if (dimension, value) not in existing_keys
+        ]
+        
+        if updates:
+            db.connection().execute(
+                update(models.AnalyticsCounter.__table__).where(
+                    models.AnalyticsCounter.dimension == bindparam("b_dimension"),
+                    models.AnalyticsCounter.value == bindparam("b_value")
+                ).values(count=models.AnalyticsCounter.count + bindparam("delta")),
+                updates
+            )
+        if not inserts:
+            return
+        try:
+            with db.begin_nested():
+                db.execute(insert(models.AnalyticsCounter), inserts)
+            return
+        except IntegrityError:
+            # Retry only the inserts; the updates above are kept
+            pending = {(row["dimension"], row["value"]): row["count"] for row in inserts}
+
+
+def apply_project_change(
+    db: Session,
+    old_state: Optional[Dict[str, Any]],
+    new_state: Optional[Dict[str, Any]]
+) -> None:
+    """
+    Incrementally update the snapshot for one project write, in the caller's transaction.
+    
+    Args:
+        db: SQLAlchemy session
+        old_state: Project state before the write (None for a create)
+        new_state: Project state after the write (None for a delete)
+    """
+    apply_project_changes(db, [(old_state, new_state)])
+
+
+def apply_project_changes(
+    db: Session,
+    changes: Sequence[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]
+) -> None:
+    """
+    Incrementally update the snapshot for many project writes with set-wise statements.
+    
+    Args:
+        db: SQLAlchemy session
+        changes: (old state, new state) per project, None for a create/delete side
+    """
+    if not is_snapshot_enabled() or not changes:
+        return
+    
+    deltas = Counter()
+    for old_state, new_state in changes:
+        deltas.update(get_counter_contributions(new_state))
+        deltas.subtract(get_counter_contributions(old_state))
+    apply_counter_deltas(db, deltas)
+    
+    removed_ids = [old_state["id"] for old_state, new_state in changes if new_state is None]
+    summaries = {
+        new_state["id"]: {
+            "project_id": new_state["id"],
+            "project_title": new_state["title"],
+            "status": new_state["status"],
+            "total_milestones": new_state["total_milestones"],
+            "active_milestones": new_state["active_milestones"],
+        }
+        for _, new_state in changes if new_state is not None
+    }
+    for batch in _batches(removed_ids):
+        db.execute(delete(models.ProjectMilestoneSummary).where(
+            models.ProjectMilestoneSummary.project_id.in_(batch)
+        ))
+    if summaries:
+        existing_ids = set()
+        for batch in _batches(list(summaries)):
+            existing_ids.update(db.execute(
+                select(models.ProjectMilestoneSummary.project_id).where(
+                    models.ProjectMilestoneSummary.project_id.in_(batch)
+                )
+            ).scalars())
+        updates = [summary for project_id, summary in summaries.items() if project_id in existing_ids]
+        inserts = [summary for project_id, summary in summaries.items() if project_id not in existing_ids]
+        if updates:
+            db.execute(update(models.ProjectMilestoneSummary), updates)
+        if inserts:
+            db.execute(insert(models.ProjectMilestoneSummary), inserts)
+
+
+def rebuild_analytics_snapshot(db: Session) -> int:
+    """
+    Recompute the whole snapshot from the raw tables, e.g. after enabling it or for repair.
+    
+    Args:
+        db: SQLAlchemy session
+        
+    Returns:
+        Number of active projects counted
+    """
+    totals = Counter()
+    summaries = []
+    last_id = None
+    while True:
+        query = db.query(models.Project).options(
+            *get_active_children_options()
+        ).filter(get_active_only_filter(models.Project))
+        if last_id is not None:
+            query = query.filter(models.Project.id > last_id)
+        projects = query.order_by(models.Project.id).limit(REBUILD_PAGE_SIZE).all()
+        if not projects:
+            break
+        
+        for project in projects:
+            state = project_state_from_model(project)
+            totals.update(get_counter_contributions(state))
+            summaries.append({
+                "project_id": state["id"],
+                "project_title": state["title"],
+                "status": state["status"],
+                "total_milestones": state["total_milestones"],
+                "active_milestones": state["active_milestones"],
+            })
+        last_id = projects[-1].id
+        db.expunge_all()
+    
+    db.execute(delete(models.AnalyticsCounter))
+    db.execute(delete(models.ProjectMilestoneSummary))
+    if totals:
+        db.execute(insert(models.AnalyticsCounter), [
+            {"dimension": dimension, "value": value, "count": count}
+            for (dimension, value), count in totals.items() if count
+        ])
+    if summaries:
+        db.execute(insert(models.ProjectMilestoneSummary), summaries)
+    db.commit()
+    return len(summaries)
+
+
+def build_overview_statements() -> Tuple[Select, Select]:
+    """Build the snapshot statements behind /analytics/overview: (non-tag counters, top tags)"""
+    counters = select(models.AnalyticsCounter).where(
+        models.AnalyticsCounter.dimension != TAG_DIMENSION,
+        models.AnalyticsCounter.count > 0
+    )
+    top_tags = select(
+        models.Tag.name.label("tag"),
+        models.AnalyticsCounter.count
+    ).join(
+        models.Tag, models.AnalyticsCounter.value == cast(models.Tag.id, String)
+    ).where(
+        models.AnalyticsCounter.dimension == TAG_DIMENSION,
+        models.AnalyticsCounter.count > 0
+    ).order_by(models.AnalyticsCounter.count.desc()).limit(10)
+    return counters, top_tags
+
+
+def shape_overview(
+    counters: Sequence[models.AnalyticsCounter],
+    top_tags: Sequence[Any]
+) -> Dict[str, Any]:
+    """Build the /analytics/overview response from the snapshot counters"""
+    by_dimension: Dict[str, List[models.AnalyticsCounter]] = {}
+    for counter in counters:
+        by_dimension.setdefault(counter.dimension, []).append(counter)
+    totals = {counter.value: counter.count for counter in by_dimension.get(TOTAL_DIMENSION, [])}
+    
+    def breakdown(dimension: str, label: str) -> List[Dict[str, Any]]:
+        return [{label: counter.value, "count": counter.count} for counter in by_dimension.get(dimension, [])]
+    
+    return {
+        "totalProjects": totals.get("projects", 0),
+        "activeMilestones": totals.get("active_milestones", 0),
+        "projectsByStatus": breakdown("status", "status"),
+        "projectsByFunction": breakdown("business_function", "function"),
+        "projectsByBenefits": breakdown("benefits_category", "category"),
+        "projectsByAIBenefits": breakdown("ai_benefit_category", "category"),
+        "topTags": [{"tag": row.tag, "count": row.count} for row in top_tags]
+    }
+
+
+def read_overview(db: Session) -> Dict[str, Any]:
+    """Build the /analytics/overview response from the snapshot"""
+    counters_statement, top_tags_statement = build_overview_statements()
+    return shape_overview(
+        db.execute(counters_statement).scalars().all(),
+        db.execute(top_tags_statement).all()
+    )
+
+
+def build_timeline_statement() -> Select:
+    """Build the snapshot statement behind /analytics/timeline"""
+    return select(models.ProjectMilestoneSummary).order_by(models.ProjectMilestoneSummary.project_id)
+
+
+def shape_timeline(summaries: Sequence[models.ProjectMilestoneSummary]) -> Dict[str, Any]:
+    """Build the /analytics/timeline response from the milestone summaries"""
+    project_progress = []
+    for summary in summaries:
+        completed = summary.total_milestones - summary.active_milestones
+        project_progress.append({
+            "projectId": summary.project_id,
+            "projectTitle": summary.project_title,
+            "status": summary.status,
+            "totalMilestones": summary.total_milestones,
+            "activeMilestones": summary.active_milestones,
+            "completedMilestones": completed,
+            "progressPercentage": (completed * 100.0 / summary.total_milestones) if summary.total_milestones > 0 else 0.0
+        })
+    
+    return {
+        "projectProgress": project_progress,
+        "totalTimelineItems": sum(summary.total_milestones for summary in summaries)
+    }
+
+
+def read_timeline(db: Session) -> Dict[str, Any]:
+    """Build the /analytics/timeline response from the snapshot"""
+    return shape_timeline(db.execute(build_timeline_statement()).scalars().all())
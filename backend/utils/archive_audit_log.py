@@ -0,0 +1,33 @@
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import SessionLocal, get_settings
+from utils.audit_archive import archive_audit_log
+
+if __name__ == "__main__":
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Move audit rows past the retention policy into the archive")
+    parser.add_argument("--retention-days", type=int, default=settings.AUDIT_RETENTION_DAYS)
+    parser.add_argument("--max-rows", type=int, default=settings.AUDIT_RETENTION_MAX_ROWS)
+    parser.add_argument("--batch-size", type=int, default=settings.AUDIT_ARCHIVE_BATCH_SIZE)
+    parser.add_argument("--max-batches", type=int, default=None,
+                        help="Stop after this many batches; run again later to continue")
+    parser.add_argument("--archive-dir", default=settings.AUDIT_ARCHIVE_DIR)
+    args = parser.parse_args()
+
+    print(f"Archiving audit rows to {args.archive_dir}...")
+    db = SessionLocal()
+    try:
+        archived = archive_audit_log(
+            db,
+            args.archive_dir,
+            args.retention_days,
+            args.max_rows,
+            batch_size=args.batch_size,
+            max_batches=args.max_batches
+        )
+        print(f"Archived {archived} audit rows.")
+    finally:
+        db.close()
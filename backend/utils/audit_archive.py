@@ -0,0 +1,277 @@
+import gzip
+import json
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from models import AuditLog
+from utils.audit_queries import AuditCursor, audit_log_to_dict, encode_audit_position
+
+# One gzip JSON-lines segment per (UTC) day of audit timestamps: audit-2024-05-01.jsonl.gz
+SEGMENT_PREFIX = "audit-"
+SEGMENT_SUFFIX = ".jsonl.gz"
+
+# Ids per archived-row DELETE, whatever the batch size
+DELETE_CHUNK_SIZE = 1000
+
+
+def _as_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Audit timestamps are stored as naive UTC; bring query bounds into the same form"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def segment_path(archive_dir: str, day: date) -> str:
+    """Path of the archive segment holding one day's audit rows"""
+    return os.path.join(archive_dir, f"{SEGMENT_PREFIX}{day.isoformat()}{SEGMENT_SUFFIX}")
+
+
+def list_segments(archive_dir: str) -> List[Tuple[date, str]]:
+    """List (day, path) of all archive segments, newest first"""
+    if not os.path.isdir(archive_dir):
+        return []
+    segments = []
+    for file_name in os.listdir(archive_dir):
+        if not (file_name.startswith(SEGMENT_PREFIX) and file_name.endswith(SEGMENT_SUFFIX)):
+            continue
+        try:
+            day = date.fromisoformat(file_name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+        except ValueError:
+            continue
+        segments.append((day, os.path.join(archive_dir, file_name)))
+    return sorted(segments, reverse=True)
+
+
+def write_segments(archive_dir: str, audit_logs: Sequence[Any]) -> None:
+    """
+    Append audit rows to their daily segments and fsync them.
+
+    Each append adds a new gzip member, which gzip readers concatenate
+    transparently, so segments never have to be rewritten.
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    by_day: Dict[date, List[str]] = {}
+    for log in audit_logs:
+        line = json.dumps(audit_log_to_dict(log), default=str)
+        by_day.setdefault(log.timestamp.date(), []).append(line)
+
+    for day, lines in by_day.items():
+        with open(segment_path(archive_dir, day), "ab") as segment:
+            with gzip.GzipFile(fileobj=segment, mode="ab") as archive:
+                archive.write(("\n".join(lines) + "\n").encode("utf-8"))
+            segment.flush()
+            os.fsync(segment.fileno())
+
+
+def get_archive_cutoff(
+    db: Session,
+    retention_days: int,
+    max_rows: int,
+    now: Optional[datetime] = None
+) -> Optional[datetime]:
+    """
+    Work out the timestamp before which audit rows are archived.
+
+    Args:
+        db: SQLAlchemy session
+        retention_days: Keep rows newer than this many days (0 disables)
+        max_rows: Keep at most roughly this many newest rows (0 disables)
+        now: Reference time as naive UTC (defaults to the current time)
+
+    Returns:
+        The cutoff, or None if no policy applies
+    """
+    cutoffs = []
+    if retention_days > 0:
+        cutoffs.append((now or _as_naive_utc(datetime.now(timezone.utc))) - timedelta(days=retention_days))
+    if max_rows > 0:
+        # Timestamp of the oldest row that is still within the row budget
+        oldest_kept = db.execute(
+            select(AuditLog.timestamp)
+            .order_by(AuditLog.timestamp.desc(), AuditLog.id.desc())
+            .offset(max_rows - 1)
+            .limit(1)
+        ).scalar()
+        if oldest_kept is not None:
+            cutoffs.append(oldest_kept)
+    return max(cutoffs) if cutoffs else None
+
+
+def archive_batch(db: Session, archive_dir: str, cutoff: datetime, batch_size: int) -> int:
+    """
+    Move the oldest batch of audit rows before the cutoff into the archive.
+
+    Rows are written and fsynced before they are deleted, in a short
+    transaction of their own. If the process dies in between, the rows are
+    archived again on the next run and read_archived_audit_logs drops the
+    duplicates.
+
+    Returns:
+        Number of rows archived
+    """
+    audit_logs = db.execute(
+        select(AuditLog)
+        .where(AuditLog.timestamp < cutoff)
+        .order_by(AuditLog.timestamp, AuditLog.id)
+        .limit(batch_size)
+    ).scalars().all()
+    if not audit_logs:
+        return 0
+
+    write_segments(archive_dir, audit_logs)
+    # Delete by id in chunks: SQL Server allows 2100 parameters per statement
+    archived_ids = [log.id for log in audit_logs]
+    for start in range(0, len(archived_ids), DELETE_CHUNK_SIZE):
+        db.execute(delete(AuditLog).where(AuditLog.id.in_(archived_ids[start:start + DELETE_CHUNK_SIZE])))
+    db.commit()
+    db.expunge_all()
+    return len(audit_logs)
+
+
+def archive_audit_log(
+    db: Session,
+    archive_dir: str,
+    retention_days: int,
+    max_rows: int,
+    batch_size: int = 1000,
+    max_batches: Optional[int] = None
+) -> int:
+    """
+    Apply the retention policies, archiving in bounded batches.
+
+    Args:
+        db: SQLAlchemy session
+        archive_dir: Directory holding the archive segments
+        retention_days: Age policy (0 disables)
+        max_rows: Size policy (0 disables)
+        batch_size: Rows moved per transaction
+        max_batches: Stop after this many batches (None runs until caught up)
+
+    Returns:
+        Total number of rows archived
+    """
+    cutoff = get_archive_cutoff(db, retention_days, max_rows)
+    if cutoff is None:
+        return 0
+
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        archived = archive_batch(db, archive_dir, cutoff, batch_size)
+        total += archived
+        batches += 1
+        if archived < batch_size:
+            break
+    return total
+
+
+def _read_segment(path: str) -> List[Dict[str, Any]]:
+    """Read one segment, dropping rows archived twice"""
+    records = {}
+    with gzip.open(path, "rt", encoding="utf-8") as archive:
+        for line in archive:
+            if line.strip():
+                record = json.loads(line)
+                records[record["id"]] = record
+    return list(records.values())
+
+
+def _matches(
+    record: Dict[str, Any],
+    timestamp: datetime,
+    filters: Dict[str, Any],
+    since: Optional[datetime],
+    until: Optional[datetime],
+    cursor: Optional[AuditCursor]
+) -> bool:
+    """Apply the audit API filters to an archived record"""
+    if any(record.get(field) != value for field, value in filters.items()):
+        return False
+    if since is not None and timestamp < since:
+        return False
+    if until is not None and timestamp >= until:
+        return False
+    if cursor is not None and (timestamp, record["id"]) >= cursor:
+        return False
+    return True
+
+
+def read_archived_audit_logs(
+    archive_dir: str,
+    filters: Dict[str, Any],
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[AuditCursor] = None,
+    limit: int = 50,
+    include_data: bool = True
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Read archived audit rows newest first, with the same filters and keyset
+    paging as build_audit_log_statement.
+
+    Only the segments whose day can match the time range and cursor are opened.
+
+    Returns:
+        (rows in API format, cursor for the next page or None)
+    """
+    since, until = _as_naive_utc(since), _as_naive_utc(until)
+    results = []
+    for day, path in list_segments(archive_dir):
+        if since is not None and day < since.date():
+            break
+        if until is not None and day > until.date():
+            continue
+        if cursor is not None and day > cursor[0].date():
+            continue
+
+        matched = []
+        for record in _read_segment(path):
+            timestamp = datetime.fromisoformat(record["timestamp"])
+            if _matches(record, timestamp, filters, since, until, cursor):
+                matched.append(((timestamp, record["id"]), record))
+        matched.sort(key=lambda item: item[0], reverse=True)
+        results.extend(matched)
+        if len(results) > limit:
+            break
+
+    next_cursor = None
+    if len(results) > limit:
+        results = results[:limit]
+        last_position = results[-1][0] if results else cursor
+        next_cursor = encode_audit_position(last_position)
+
+    records = []
+    for _, record in results:
+        if not include_data:
+            record.pop("old_data", None)
+            record.pop("new_data", None)
+        records.append(record)
+    return records, next_cursor
+
+
+def read_archived_row_history(
+    archive_dir: str,
+    table_name: str,
+    row_id: str,
+    until: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """
+    Read the archived audit rows of one row, oldest first, up to and including `until`.
+
+    Returns:
+        Rows in API format
+    """
+    until = _as_naive_utc(until)
+    filters = {"table_name": table_name, "row_id": str(row_id)}
+    matched = []
+    for day, path in list_segments(archive_dir):
+        if until is not None and day > until.date():
+            continue
+        for record in _read_segment(path):
+            timestamp = datetime.fromisoformat(record["timestamp"])
+            if _matches(record, timestamp, filters, None, None, None) and (until is None or timestamp <= until):
+                matched.append(((timestamp, record["id"]), record))
+    matched.sort(key=lambda item: item[0])
+    return [record for _, record in matched]
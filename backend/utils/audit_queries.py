@@ -0,0 +1,102 @@
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import defer
+from sqlalchemy.sql import Select
+from models import AuditLog
+
+MAX_AUDIT_PAGE_SIZE = 1000
+
+# Equality filters accepted by the audit API
+AUDIT_FILTER_FIELDS = ("table_name", "row_id", "actor", "action", "context")
+
+# Keyset position: (timestamp, id) of the last row of the previous page
+AuditCursor = Tuple[datetime, int]
+
+
+def encode_audit_cursor(log: Any) -> str:
+    """Encode the keyset position after an audit row"""
+    return encode_audit_position((log.timestamp, log.id))
+
+
+def encode_audit_position(position: AuditCursor) -> str:
+    """Encode a (timestamp, id) keyset position"""
+    timestamp, log_id = position
+    return f"{timestamp.isoformat()}|{log_id}"
+
+
+def decode_audit_cursor(cursor: str) -> AuditCursor:
+    """
+    Decode a cursor produced by encode_audit_cursor.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    timestamp, _, log_id = cursor.rpartition("|")
+    return datetime.fromisoformat(timestamp), int(log_id)
+
+
+def build_audit_log_statement(
+    filters: Dict[str, Any],
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[AuditCursor] = None,
+    limit: int = 50,
+    include_data: bool = True
+) -> Select:
+    """
+    Build a newest-first, keyset-paginated audit log query.
+    
+    Every equality filter combination used by the API is backed by an index that
+    leads with the filtered column(s) and continues with timestamp, so pages are
+    index range seeks rather than a sort of the whole table.
+    
+    Args:
+        filters: Column name -> value for the AUDIT_FILTER_FIELDS to match
+        since: Only entries at or after this time
+        until: Only entries before this time
+        cursor: Position after which to continue
+        limit: Page size; one extra row is fetched to detect a following page
+        include_data: Whether to load the old_data/new_data snapshots
+    """
+    statement = select(AuditLog)
+    for field, value in filters.items():
+        statement = statement.where(getattr(AuditLog, field) == value)
+    if since is not None:
+        statement = statement.where(AuditLog.timestamp >= since)
+    if until is not None:
+        statement = statement.where(AuditLog.timestamp < until)
+    if cursor is not None:
+        cursor_timestamp, cursor_id = cursor
+        statement = statement.where(or_(
+            AuditLog.timestamp < cursor_timestamp,
+            and_(AuditLog.timestamp == cursor_timestamp, AuditLog.id < cursor_id)
+        ))
+    if not include_data:
+        statement = statement.options(defer(AuditLog.old_data), defer(AuditLog.new_data))
+    return statement.order_by(AuditLog.timestamp.desc(), AuditLog.id.desc()).limit(limit + 1)
+
+
+def split_audit_page(logs: Sequence[Any], limit: int) -> Tuple[Sequence[Any], Optional[str]]:
+    """Trim the extra row fetched by build_audit_log_statement and derive the next cursor"""
+    if len(logs) <= limit:
+        return logs, None
+    logs = logs[:limit]
+    return logs, encode_audit_cursor(logs[-1])
+
+
+def audit_log_to_dict(log: Any, include_data: bool = True) -> Dict[str, Any]:
+    """Convert an audit row to its API format"""
+    log_dict = {
+        "id": log.id,
+        "table_name": log.table_name,
+        "row_id": log.row_id,
+        "action": log.action,
+        "context": log.context,
+        "timestamp": log.timestamp.isoformat(),
+        "actor": log.actor
+    }
+    if include_data:
+        log_dict["old_data"] = log.old_data
+        log_dict["new_data"] = log.new_data
+    return log_dict
@@ -0,0 +1,91 @@
+from datetime import datetime
+from typing import Dict, Any, Optional, Sequence
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from models import AuditLog
+from utils.audit_archive import read_archived_row_history
+
+
+def replay_audit_entries(entries: Sequence[Any]) -> Optional[Dict[str, Any]]:
+    """
+    Rebuild a row's state by applying its audit entries in order.
+    
+    Works with both full and diff snapshots: INSERT sets the baseline, UPDATE
+    overlays the new values it recorded, and DELETE (a soft delete) leaves the
+    last state with is_active False. Rows whose history starts with an UPDATE
+    begin from that entry's old values.
+    
+    Args:
+        entries: Audit entries of one row, oldest first
+        
+    Returns:
+        The reconstructed column values, or None if there is no history
+    """
+    state = None
+    for entry in entries:
+        if entry.action == "INSERT":
+            state = dict(entry.new_data or {})
+        elif entry.action == "UPDATE":
+            if state is None:
+                state = dict(entry.old_data or {})
+            state.update(entry.new_data or {})
+        elif entry.action == "DELETE":
+            if state is None:
+                state = dict(entry.old_data or {})
+            state["is_active"] = False
+    return state
+
+
+def _archived_entry(record: Dict[str, Any]) -> AuditLog:
+    """Turn an archived audit record back into a (transient) audit row for replay"""
+    return AuditLog(
+        id=record["id"],
+        action=record["action"],
+        old_data=record.get("old_data"),
+        new_data=record.get("new_data"),
+        timestamp=datetime.fromisoformat(record["timestamp"]),
+    )
+
+
+def reconstruct_row(
+    db: Session,
+    table_name: str,
+    row_id: str,
+    at: Optional[datetime] = None,
+    archive_dir: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Reconstruct the state of a row at a point in time from the audit log.
+    
+    When the live history doesn't start with the row's INSERT, retention has
+    archived its beginning; with `archive_dir` the archived entries are merged
+    in first, so diff-mode updates replay onto the full baseline.
+    
+    Args:
+        db: SQLAlchemy session
+        table_name: Name of the audited table
+        row_id: Primary key of the row
+        at: Point in time (defaults to now)
+        archive_dir: Directory holding the audit archive segments
+        
+    Returns:
+        The row's column values as of `at`, or None if it didn't exist yet
+    """
+    statement = select(AuditLog).where(
+        AuditLog.table_name == table_name,
+        AuditLog.row_id == str(row_id)
+    )
+    if at is not None:
+        statement = statement.where(AuditLog.timestamp <= at)
+    entries = db.execute(statement.order_by(AuditLog.timestamp, AuditLog.id)).scalars().all()
+    
+    if archive_dir is not None and (not entries or entries[0].action != "INSERT"):
+        live_ids = {entry.id for entry in entries}
+        # A batch archived just before a crash can still be in the table too
+        archived = [
+            _archived_entry(record)
+            for record in read_archived_row_history(archive_dir, table_name, row_id, at)
+            if record["id"] not in live_ids
+        ]
+        entries = archived + list(entries)
+    return replay_audit_entries(entries)
@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Optional
-from sqlalchemy.orm import Session
-from models import AuditMixin
+from typing import List, Optional
+from sqlalchemy.orm import selectinload
+from models import AuditMixin, Project, TimelineItem, ProjectTag, ProjectIndividual
 
 
 def set_audit_fields(obj: AuditMixin, user_id: Optional[str] = None, is_update: bool = False):
@@ -36,17 +36,24 @@ def auto_populate_audit_fields(db_obj: AuditMixin, is_update: bool = False, user
     set_audit_fields(db_obj, user_id, is_update)
 
 
-def soft_delete(db: Session, obj: AuditMixin, user_id: Optional[str] = None):
-    """Soft delete an object by setting is_active to False"""
-    if user_id is None:
-        user_id = get_current_user_id()
-    
-    obj.is_active = False
-    obj.updated_at = datetime.utcnow()
-    obj.updated_by = user_id
-    db.commit()
-
-
 def get_active_only_filter(model_class):
     """Get filter condition for active records only"""
-    return model_class.is_active == True
\ No newline at end of file
+    return model_class.is_active == True
+
+
+def get_active_children_options(relationships: Optional[List[str]] = None):
+    """Get loader options that batch-load a project's active children
+    (one SELECT ... WHERE project_id IN (...) per relationship, soft-deleted rows excluded)
+    """
+    child_models = {
+        "tags": ProjectTag,
+        "individuals": ProjectIndividual,
+        "timeline": TimelineItem,
+    }
+    if relationships is None:
+        relationships = list(child_models)
+    
+    return [
+        selectinload(getattr(Project, name).and_(get_active_only_filter(child_models[name])))
+        for name in relationships
+    ]
@@ -0,0 +1,20 @@
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import get_engine
+from utils.timeline_dates import BACKFILL_BATCH_SIZE, backfill_date_values
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Populate timeline_items.date_value from the date strings")
+    parser.add_argument("--batch-size", type=int, default=BACKFILL_BATCH_SIZE, help="Rows per transaction")
+    parser.add_argument("--reparse", action="store_true", help="Also re-parse rows that already have a date_value")
+    args = parser.parse_args()
+
+    with get_engine().connect() as conn:
+        counts = backfill_date_values(conn, batch_size=args.batch_size, reparse=args.reparse, commit=True)
+    print(
+        f"Scanned {counts['scanned']} timeline items: {counts['updated']} updated, "
+        f"{counts['unparsed']} without a recognisable date."
+    )
@@ -0,0 +1,185 @@
+import json
+import time
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+from sqlalchemy.orm import Session
+import audit_logging
+from utils.bulk_sync import upsert_projects
+
+DEFAULT_CHUNK_SIZE = 500
+IMPORT_CONTEXT = "bulk-import"
+
+# Project column -> key in the import records (the public/data/mockProjects.json format)
+PROJECT_RECORD_FIELDS = {
+    "title": "title",
+    "description": "description",
+    "status": "status",
+    "why_we_built_this": "whyWeBuiltThis",
+    "what_weve_built": "whatWeveBuilt",
+    "nti_status": "ntiStatus",
+    "nti_link": "ntiLink",
+    "primary_benefits_category": "primaryBenefitsCategory",
+    "primary_ai_benefit_category": "primaryAIBenefitCategory",
+    "investment_required": "investmentRequired",
+    "expected_near_term_benefits": "expectedNearTermBenefits",
+    "expected_long_term_benefits": "expectedLongTermBenefits",
+    "primary_business_function": "primaryBusinessFunction",
+}
+
+# Keys an import record and its timeline items must carry (NOT NULL columns, required by the API schema)
+REQUIRED_RECORD_KEYS = ("title", "description", "status")
+REQUIRED_TIMELINE_KEYS = ("title", "description", "date")
+
+
+def _tag_rows(record: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"tag": tag} for tag in record.get("tags", [])]
+
+
+def _individual_rows(record: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"name": name} for name in record.get("individualsInvolved", [])]
+
+
+def _timeline_rows(record: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "title": item.get("title"),
+            "description": item.get("description"),
+            "date": item.get("date"),
+            "is_step_active": item.get("isStepActive", False),
+        }
+        for item in record.get("timeline", [])
+    ]
+
+
+# Child collection -> reader of its rows from an import record
+CHILD_RECORD_READERS = {
+    "tags": _tag_rows,
+    "individuals": _individual_rows,
+    "timeline": _timeline_rows,
+}
+
+
+def iter_project_records(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Read project records from a JSON-lines file (one project per line) or a JSON array.
+
+    JSON-lines input is streamed; a JSON array has to be parsed in one go.
+    """
+    if path.endswith((".jsonl", ".ndjson")):
+        with open(path, encoding="utf-8") as source:
+            for line in source:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(path, encoding="utf-8") as source:
+            yield from json.load(source)
+
+
+def chunked(records: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Split an iterable into lists of at most `size` items"""
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def validate_record(record: Dict[str, Any]) -> List[str]:
+    """List what an import record is missing, so it can be reported instead of failing its chunk"""
+    # The id is the upsert key: without it a re-run could not find the project again
+    problems = [] if record.get("id") else ["missing 'id'"]
+    problems.extend(f"missing '{key}'" for key in REQUIRED_RECORD_KEYS if record.get(key) is None)
+    for position, item in enumerate(record.get("timeline", []), start=1):
+        problems.extend(
+            f"timeline item {position} missing '{key}'"
+            for key in REQUIRED_TIMELINE_KEYS if item.get(key) is None
+        )
+    return problems
+
+
+def split_valid_records(
+    records: List[Dict[str, Any]],
+    first_position: int = 1
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Separate importable records from invalid ones.
+
+    Returns:
+        (valid records, one message per rejected record naming its position and id)
+    """
+    valid, rejected = [], []
+    for position, record in enumerate(records, start=first_position):
+        problems = validate_record(record)
+        if problems:
+            rejected.append(f"record {position} (id {record.get('id')!r}): {', '.join(problems)}")
+        else:
+            valid.append(record)
+    return valid, rejected
+
+
+def record_to_item(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert an import record to the item format of bulk_sync.upsert_projects"""
+    item = {"values": {column: record.get(key) for column, key in PROJECT_RECORD_FIELDS.items()}}
+    for name, read_rows in CHILD_RECORD_READERS.items():
+        item[name] = read_rows(record)
+    return item
+
+
+def import_chunk(db: Session, records: List[Dict[str, Any]], user_id: Optional[str] = None) -> Dict[str, int]:
+    """
+    Upsert one chunk of project records (and their children) in a single transaction.
+
+    Returns:
+        Row counts for the chunk
+    """
+    # Last record wins if an id repeats within the chunk
+    items = {record["id"]: record_to_item(record) for record in records}
+    _, counts = upsert_projects(db, items, IMPORT_CONTEXT, user_id)
+    db.commit()
+    db.expunge_all()
+    return counts
+
+
+def import_projects(
+    db: Session,
+    records: Iterable[Dict[str, Any]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    user_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Idempotently import project records in chunks, upserting on id.
+
+    Each chunk is committed on its own, so an interrupted import can simply be
+    run again. Audit rows are buffered and written with each chunk's commit,
+    and the analytics snapshot (if enabled) is maintained along the way.
+    Records missing required values are skipped and reported in "rejected".
+
+    Args:
+        db: SQLAlchemy session
+        records: Project records in the mockProjects.json format
+        chunk_size: Projects per transaction
+        user_id: Recorded in created_by/updated_by
+
+    Returns:
+        Row counts, rejected records, elapsed seconds and throughput
+    """
+    audit_logging.begin_audit_buffer(db)
+    totals: Dict[str, Any] = {}
+    rejected: List[str] = []
+    project_count = 0
+    started = time.perf_counter()
+    for chunk in chunked(records, chunk_size):
+        valid, chunk_rejected = split_valid_records(chunk, project_count + 1)
+        rejected.extend(chunk_rejected)
+        if valid:
+            for key, value in import_chunk(db, valid, user_id).items():
+                totals[key] = totals.get(key, 0) + value
+        project_count += len(chunk)
+
+    elapsed = time.perf_counter() - started
+    totals["projects_read"] = project_count
+    totals["rejected"] = rejected
+    totals["seconds"] = round(elapsed, 3)
+    totals["projects_per_second"] = round(project_count / elapsed, 1) if elapsed > 0 else None
+    return totals
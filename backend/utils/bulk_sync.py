@@ -0,0 +1,353 @@
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+import audit_logging
+from models import Project, ProjectTag, ProjectIndividual, TimelineItem
+from utils import analytics_snapshot
+from utils.audit_utils import get_current_user_id
+from utils.dimensions import DIMENSIONS, attach_dimension_ids
+from utils.timeline_dates import attach_date_values
+
+# Child collection -> (model, identity columns, updatable columns);
+# identities match the keys smart_update diffs on
+CHILD_TABLES = {
+    "tags": (ProjectTag, ("tag_id",), ()),
+    "individuals": (ProjectIndividual, ("person_id",), ()),
+    "timeline": (TimelineItem, ("title", "date"), ("description", "is_step_active")),
+}
+
+# Project columns set from a create/update payload
+PROJECT_VALUE_COLUMNS = (
+    "title", "description", "status", "why_we_built_this", "what_weve_built", "nti_status",
+    "nti_link", "primary_benefits_category", "primary_ai_benefit_category", "investment_required",
+    "expected_near_term_benefits", "expected_long_term_benefits", "primary_business_function",
+)
+
+# Largest batch accepted by POST /projects/batch (ids are looked up with one IN list)
+MAX_BATCH_SIZE = 1000
+
+# Per-project outcomes of upsert_projects
+CREATED = "created"
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+
+
+def get_audit_field_values(now: datetime, user_id: Optional[str], is_update: bool) -> Dict[str, Any]:
+    """Bulk counterpart of audit_utils.set_audit_fields"""
+    fields = {"updated_at": now, "updated_by": user_id, "is_active": True}
+    if not is_update:
+        fields.update(created_at=now, created_by=user_id)
+    return fields
+
+
+def comparable_value(value: Any) -> str:
+    """Normalise a project field for change checks: None and "" are the same, everything else compares as a string"""
+    return str(value) if value is not None else ""
+
+
+def _row_key(row: Dict[str, Any], key_fields: Tuple[str, ...]) -> Tuple[Any, ...]:
+    return tuple(row[field] for field in key_fields)
+
+
+def insert_rows(db: Session, model: Any, rows: List[Dict[str, Any]], context: str) -> List[Dict[str, Any]]:
+    """
+    executemany INSERT, returning generated ids in parameter order, with one audit row per insert.
+
+    Returns:
+        The inserted rows including their ids
+    """
+    if not rows:
+        return []
+    if model is Project:
+        db.execute(insert(model), rows)
+        inserted = rows
+    else:
+        ids = db.scalars(insert(model).returning(model.id, sort_by_parameter_order=True), rows).all()
+        inserted = [{"id": row_id, **row} for row_id, row in zip(ids, rows)]
+    for row in inserted:
+        audit_logging.log_audit_change(
+            db, model.__tablename__, row["id"], "INSERT",
+            new_data=audit_logging.serialize_row(row), context=context
+        )
+    return inserted
+
+
+def update_rows(db: Session, model: Any, changes: List[Tuple[Dict[str, Any], Dict[str, Any]]], context: str) -> None:
+    """
+    ORM bulk UPDATE by primary key for (old row, changed values) pairs, with audit rows.
+
+    Changes that set is_active to False are audited as (soft) deletes.
+    """
+    if not changes:
+        return
+    db.execute(update(model), [{"id": old["id"], **values} for old, values in changes])
+    for old, values in changes:
+        if values.get("is_active") is False:
+            audit_logging.log_audit_change(
+                db, model.__tablename__, old["id"], "DELETE",
+                old_data=audit_logging.serialize_row(old), context=context
+            )
+        else:
+            audit_logging.log_row_update(
+                db, model.__tablename__, old["id"],
+                audit_logging.serialize_row(old),
+                audit_logging.serialize_row({**old, **values}),
+                context=context
+            )
+
+
+def load_active_children(
+    db: Session,
+    name: str,
+    project_ids: List[str]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Load the active rows of one child table for many projects: project id -> rows (duplicates included)"""
+    model, _, _ = CHILD_TABLES[name]
+    children: Dict[str, List[Dict[str, Any]]] = {}
+    if not project_ids:
+        return children
+    rows = db.execute(
+        select(model.__table__).where(
+            model.project_id.in_(project_ids),
+            model.is_active == True
+        )
+    ).mappings()
+    for row in rows:
+        children.setdefault(row["project_id"], []).append(dict(row))
+    return children
+
+
+def diff_children(
+    name: str,
+    incoming: Dict[str, List[Dict[str, Any]]],
+    existing: Dict[str, List[Dict[str, Any]]],
+    now: datetime,
+    user_id: Optional[str]
+) -> Tuple[List[Dict[str, Any]], List[Tuple[Dict[str, Any], Dict[str, Any]]], List[Tuple[Dict[str, Any], Dict[str, Any]]]]:
+    """
+    Compare the wanted children of many projects with their active rows.
+
+    Returns:
+        (rows to insert, (row, values) to update, (row, values) to soft-delete)
+    """
+    _, key_fields, value_fields = CHILD_TABLES[name]
+    to_insert, to_update, to_remove = [], [], []
+    for project_id, children in incoming.items():
+        # Extra active rows with the same identity (stored before it was deduplicated) are removed
+        current_children, duplicates = {}, []
+        for current in existing.get(project_id, []):
+            key = _row_key(current, key_fields)
+            if key in current_children:
+                duplicates.append(current)
+            else:
+                current_children[key] = current
+        # A repeated identity is stored once; the last occurrence wins, as in smart_update
+        unique_children = {}
+        for child in children:
+            unique_children[_row_key(child, key_fields)] = child
+        for key, child in unique_children.items():
+            current = current_children.get(key)
+            if current is None:
+                to_insert.append({"project_id": project_id, **child, **get_audit_field_values(now, user_id, False)})
+            elif any(current[field] != child[field] for field in value_fields):
+                values = {field: child[field] for field in value_fields}
+                to_update.append((current, {**values, "updated_at": now, "updated_by": user_id}))
+        stale = [current for key, current in current_children.items() if key not in unique_children]
+        for current in stale + duplicates:
+            to_remove.append((current, {"is_active": False, "updated_at": now, "updated_by": user_id}))
+    return to_insert, to_update, to_remove
+
+
+def payload_to_item(payload: Any) -> Dict[str, Any]:
+    """Convert a ProjectCreateSchema payload to the item format of upsert_projects"""
+    return {
+        "values": {column: getattr(payload, column) for column in PROJECT_VALUE_COLUMNS},
+        "tags": [{"tag": tag.tag} for tag in payload.tags],
+        "individuals": [{"name": individual.name} for individual in payload.individuals],
+        "timeline": [
+            {
+                "title": item.title,
+                "description": item.description,
+                "date": item.date,
+                "is_step_active": item.is_step_active,
+            }
+            for item in payload.timeline
+        ],
+    }
+
+
+def _analytics_state(project: Dict[str, Any], children: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+    return analytics_snapshot.project_state_from_rows(project, children["tags"], children["timeline"])
+
+
+def upsert_projects(
+    db: Session,
+    items: Dict[str, Dict[str, Any]],
+    context: str,
+    user_id: Optional[str] = None
+) -> Tuple[Dict[str, str], Dict[str, int]]:
+    """
+    Create or update many projects and their children with set-wise statements.
+
+    Existing projects and their active children are loaded with one query per
+    table. New rows are written with one executemany INSERT per table, changed
+    and removed ones with one bulk UPDATE per table; audit rows go through the
+    session's buffer and the analytics snapshot gets one combined delta.
+    Soft-deleted projects are restored. The caller commits.
+
+    Tag and individual names are resolved to their dimension ids (creating new
+    ones) and diffed on those ids; new timeline items get their parsed date_value.
+
+    Args:
+        db: SQLAlchemy session
+        items: Project id -> {"values": project columns, "tags": [{"tag"}],
+               "individuals": [{"name"}], "timeline": [{"title", "description", "date", "is_step_active"}]}
+        context: Audit context for the rows written
+        user_id: Recorded in created_by/updated_by
+
+    Returns:
+        (project id -> created/updated/unchanged, row counts)
+    """
+    now = datetime.utcnow()
+    user_id = user_id or get_current_user_id()
+    project_ids = list(items)
+
+    existing_projects = {
+        row["id"]: dict(row)
+        for row in db.execute(
+            select(Project.__table__).where(Project.id.in_(project_ids))
+        ).mappings()
+    }
+    existing_ids = list(existing_projects)
+    existing_children = {name: load_active_children(db, name, existing_ids) for name in CHILD_TABLES}
+
+    new_projects, changed_projects = [], {}
+    for project_id, item in items.items():
+        current = existing_projects.get(project_id)
+        if current is None:
+            new_projects.append({"id": project_id, **item["values"], **get_audit_field_values(now, user_id, False)})
+        elif not current["is_active"] or any(
+            comparable_value(current[column]) != comparable_value(value) for column, value in item["values"].items()
+        ):
+            changed_projects[project_id] = item["values"]
+
+    for name in DIMENSIONS:
+        attach_dimension_ids(db, name, [child for item in items.values() for child in item[name]])
+    attach_date_values(child for item in items.values() for child in item["timeline"])
+
+    # Parents first so the children's foreign keys resolve
+    insert_rows(db, Project, new_projects, context)
+
+    counts = {"children_inserted": 0, "children_updated": 0, "children_removed": 0}
+    touched_projects = set()
+    for name, (model, _, _) in CHILD_TABLES.items():
+        incoming = {project_id: item[name] for project_id, item in items.items()}
+        to_insert, to_update, to_remove = diff_children(name, incoming, existing_children[name], now, user_id)
+        insert_rows(db, model, to_insert, context)
+        update_rows(db, model, to_update + to_remove, context)
+        touched_projects.update(row["project_id"] for row in to_insert)
+        touched_projects.update(old["project_id"] for old, _ in to_update + to_remove)
+        counts["children_inserted"] += len(to_insert)
+        counts["children_updated"] += len(to_update)
+        counts["children_removed"] += len(to_remove)
+
+    # Changed projects, and those whose children changed, get new audit fields
+    project_updates = [
+        (existing_projects[project_id], {**changed_projects.get(project_id, {}), **get_audit_field_values(now, user_id, True)})
+        for project_id in existing_ids
+        if project_id in changed_projects or project_id in touched_projects
+    ]
+    update_rows(db, Project, project_updates, context)
+
+    if analytics_snapshot.is_snapshot_enabled():
+        changes = []
+        for project_id, item in items.items():
+            current = existing_projects.get(project_id)
+            old_state = None
+            if current is not None and current["is_active"]:
+                old_children = {
+                    name: existing_children[name].get(project_id, [])
+                    for name in CHILD_TABLES
+                }
+                old_state = _analytics_state(current, old_children)
+            changes.append((old_state, _analytics_state({"id": project_id, **item["values"]}, item)))
+        analytics_snapshot.apply_project_changes(db, changes)
+
+    updated_ids = {old["id"] for old, _ in project_updates}
+    results = {
+        project_id: CREATED if project_id not in existing_projects
+        else UPDATED if project_id in updated_ids
+        else UNCHANGED
+        for project_id in items
+    }
+    counts["projects_inserted"] = len(new_projects)
+    counts["projects_updated"] = len(project_updates)
+    return results, counts
+
+
+def soft_delete_projects(
+    db: Session,
+    project_ids: List[str],
+    context: str,
+    user_id: Optional[str] = None
+) -> List[str]:
+    """
+    Soft delete projects and all their active children.
+
+    The rows being deleted are read once per table for the audit snapshots, then
+    is_active/updated_at/updated_by are flipped with one set-based UPDATE per
+    table. Audit rows are buffered and the analytics snapshot loses the
+    projects' contributions. The caller commits.
+
+    Returns:
+        Ids of the projects that were active and are now deleted
+    """
+    now = datetime.utcnow()
+    user_id = user_id or get_current_user_id()
+    projects = [
+        dict(row)
+        for row in db.execute(
+            select(Project.__table__).where(Project.id.in_(project_ids), Project.is_active == True)
+        ).mappings()
+    ]
+    if not projects:
+        return []
+    deleted_ids = [project["id"] for project in projects]
+    children = {name: load_active_children(db, name, deleted_ids) for name in CHILD_TABLES}
+
+    deleted_values = {"is_active": False, "updated_at": now, "updated_by": user_id}
+    for name, (model, _, _) in CHILD_TABLES.items():
+        if children[name]:
+            db.execute(
+                update(model.__table__)
+                .where(model.project_id.in_(deleted_ids), model.is_active == True)
+                .values(**deleted_values)
+            )
+    db.execute(
+        update(Project.__table__)
+        .where(Project.id.in_(deleted_ids), Project.is_active == True)
+        .values(**deleted_values)
+    )
+
+    audited = [(Project, project) for project in projects]
+    for name, (model, _, _) in CHILD_TABLES.items():
+        audited.extend(
+            (model, row)
+            for project_children in children[name].values()
+            for row in project_children
+        )
+    for model, row in audited:
+        audit_logging.log_audit_change(
+            db, model.__tablename__, row["id"], "DELETE",
+            old_data=audit_logging.serialize_row(row), context=context
+        )
+
+    if analytics_snapshot.is_snapshot_enabled():
+        analytics_snapshot.apply_project_changes(db, [
+            (_analytics_state(project, {
+                name: children[name].get(project["id"], []) for name in CHILD_TABLES
+            }), None)
+            for project in projects
+        ])
+    return deleted_ids
@@ -0,0 +1,110 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Any, Optional, Tuple
+from fastapi import Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+import models
+from utils.audit_utils import get_active_only_filter
+
+# (latest updated_at, active project count)
+RegistryVersion = Tuple[Optional[datetime], int]
+
+
+def build_registry_version_statement() -> Select:
+    """
+    Build the query for a cheap version token covering everything derived from the registry.
+    
+    Both values come from index-only subqueries in one round-trip. Soft deletes bump
+    updated_at and child changes touch their project's updated_at, so any write moves
+    the latest timestamp, while the active count guards against clock skew.
+    """
+    latest_update = select(func.max(models.Project.updated_at)).scalar_subquery()
+    active_count = select(func.count()).select_from(models.Project).where(
+        get_active_only_filter(models.Project)
+    ).scalar_subquery()
+    return select(latest_update, active_count)
+
+
+def to_registry_version(row: Any) -> RegistryVersion:
+    """Convert the row of build_registry_version_statement"""
+    return row[0], row[1] or 0
+
+
+def get_registry_version(db: Session) -> RegistryVersion:
+    """Get the registry version token: (latest updated_at, active project count)"""
+    return to_registry_version(db.execute(build_registry_version_statement()).one())
+
+
+def build_project_version_statement(project_id: str) -> Select:
+    """Build the primary key lookup of an active project's updated_at"""
+    return select(models.Project.updated_at).where(
+        models.Project.id == project_id,
+        get_active_only_filter(models.Project)
+    )
+
+
+def get_project_version(db: Session, project_id: str) -> Optional[datetime]:
+    """Get an active project's updated_at, or None if it doesn't exist"""
+    return db.execute(build_project_version_statement(project_id)).scalar()
+
+
+def make_etag(*parts: object) -> str:
+    """Build a weak ETag from the parts identifying a representation"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def get_validator_headers(etag: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+    """Get the ETag/Last-Modified response headers"""
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """
+    Evaluate If-None-Match (preferred) or If-Modified-Since against the current validators.
+    
+    Args:
+        request: Incoming request
+        etag: Current ETag of the representation
+        last_modified: Current modification time (naive UTC)
+        
+    Returns:
+        True if the client's copy is still current
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        client_tags = {tag.strip() for tag in if_none_match.split(",")}
+        # Weak comparison: W/"x" matches "x"
+        return "*" in client_tags or _strip_weak(etag) in {_strip_weak(tag) for tag in client_tags}
+    
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have one-second resolution
+        return _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+    
+    return False
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime]) -> Response:
+    """Build a 304 response carrying the validators"""
+    return Response(status_code=304, headers=get_validator_headers(etag, last_modified))
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _strip_weak(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
@@ -0,0 +1,165 @@
+from typing import List, Dict, Any, Iterable, Optional, Sequence
+from sqlalchemy import func, insert, literal, select, union_all
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+import models
+from utils.audit_utils import get_active_only_filter
+
+# Child collection -> (dimension model, link model, link id column, link name column)
+DIMENSIONS = {
+    "tags": (models.Tag, models.ProjectTag, "tag_id", "tag"),
+    "individuals": (models.Person, models.ProjectIndividual, "person_id", "name"),
+}
+
+# Largest page of the /tags and /people lookups
+MAX_LOOKUP_SIZE = 500
+
+# Names per IN list when resolving ids (SQL Server allows 2100 parameters)
+RESOLVE_BATCH_SIZE = 1000
+
+# Insert/read-back rounds before resolve_dimension_ids gives up
+MAX_RESOLVE_ATTEMPTS = 3
+
+
+def _load_ids(db: Session, model: Any, names: List[str]) -> Dict[str, int]:
+    """
+    Look names up by SQL equality, so they match under the name column's collation:
+    the given names are joined to the table as a derived table, in batches.
+    """
+    ids = {}
+    for start in range(0, len(names), RESOLVE_BATCH_SIZE):
+        wanted = union_all(*[
+            select(literal(name, model.name.type).label("name"))
+            for name in names[start:start + RESOLVE_BATCH_SIZE]
+        ]).subquery("wanted")
+        rows = db.execute(
+            select(wanted.c.name, model.id).join(model, model.name == wanted.c.name)
+        )
+        ids.update((row.name, row.id) for row in rows)
+    return ids
+
+
+def _insert_names(db: Session, model: Any, names: List[str]) -> None:
+    """
+    Insert names in one executemany INSERT in a savepoint. If that hits the unique
+    constraint (a concurrent insert, or two names the collation treats as equal),
+    insert them one at a time instead, skipping the ones that already exist.
+    """
+    try:
+        with db.begin_nested():
+            db.execute(insert(model), [{"name": name} for name in names])
+        return
+    except IntegrityError:
+        pass
+    for name in names:
+        try:
+            with db.begin_nested():
+                db.execute(insert(model), [{"name": name}])
+        except IntegrityError:
+            pass
+
+
+def resolve_dimension_ids(db: Session, model: Any, names: Iterable[str]) -> Dict[str, int]:
+    """
+    Map names to their tag/person ids, creating the missing ones.
+
+    Names are matched by the database (the name column's collation decides, e.g.
+    ignoring case and trailing spaces). Known names are looked up in batches, new
+    ones are inserted in bulk and read back the same way.
+
+    Args:
+        db: SQLAlchemy session
+        model: Tag or Person
+        names: Names as entered (duplicates allowed)
+
+    Returns:
+        name -> id for every given name
+
+    Raises:
+        RuntimeError: If some names still have no id after MAX_RESOLVE_ATTEMPTS inserts
+    """
+    names = list(names)
+    distinct_names = list(dict.fromkeys(names))
+    if not distinct_names:
+        return {}
+
+    ids = _load_ids(db, model, distinct_names)
+    missing = [name for name in distinct_names if name not in ids]
+    for _ in range(MAX_RESOLVE_ATTEMPTS):
+        if not missing:
+            break
+        _insert_names(db, model, missing)
+        ids.update(_load_ids(db, model, missing))
+        missing = [name for name in missing if name not in ids]
+    if missing:
+        raise RuntimeError(f"Could not resolve {model.__tablename__} ids for {missing[:10]}")
+    return {name: ids[name] for name in names}
+
+
+def attach_dimension_ids(db: Session, name: str, children: Iterable[Dict[str, Any]]) -> None:
+    """Set tag_id/person_id on child rows that only carry the name"""
+    model, _, id_field, name_field = DIMENSIONS[name]
+    children = list(children)
+    ids = resolve_dimension_ids(db, model, [child[name_field] for child in children])
+    for child in children:
+        child[id_field] = ids[child[name_field]]
+
+
+def _select_linked_projects(name: str, dimension_id: Any, *columns: Any) -> Select:
+    """SELECT columns FROM the link table joined to active projects, for one tag/person"""
+    _, link, id_field, _ = DIMENSIONS[name]
+    return select(*columns).select_from(link).join(
+        models.Project, models.Project.id == link.project_id
+    ).where(
+        getattr(link, id_field) == dimension_id,
+        get_active_only_filter(link),
+        get_active_only_filter(models.Project)
+    )
+
+
+def build_dimension_lookup_statement(name: str, prefix: Optional[str], limit: int) -> Select:
+    """
+    Build the /tags or /people lookup: names (optionally by prefix) with the number
+    of active projects using each, counted with a seek on the link table's id index.
+    """
+    model, link, _, _ = DIMENSIONS[name]
+    project_count = _select_linked_projects(
+        name, model.id, func.count(func.distinct(link.project_id))
+    ).scalar_subquery()
+    statement = select(model.id, model.name, project_count.label("project_count"))
+    if prefix:
+        statement = statement.where(model.name.startswith(prefix, autoescape=True))
+    return statement.order_by(model.name).limit(limit)
+
+
+def build_dimension_name_statement(name: str, dimension_id: int) -> Select:
+    """Build the primary key lookup of a tag/person name"""
+    model = DIMENSIONS[name][0]
+    return select(model.name).where(model.id == dimension_id)
+
+
+def build_dimension_projects_statement(name: str, dimension_id: int) -> Select:
+    """Build the list of active projects linked to one tag/person"""
+    return select(
+        models.Project.id,
+        models.Project.title,
+        models.Project.status
+    ).where(
+        models.Project.id.in_(_select_linked_projects(name, dimension_id, DIMENSIONS[name][1].project_id)),
+        get_active_only_filter(models.Project)
+    ).order_by(models.Project.title, models.Project.id)
+
+
+def shape_dimension_lookup(rows: Sequence[Any]) -> List[Dict[str, Any]]:
+    """Build the /tags or /people response from the rows of build_dimension_lookup_statement"""
+    return [{"id": row.id, "name": row.name, "projectCount": row.project_count} for row in rows]
+
+
+def shape_dimension_projects(dimension_id: int, dimension_name: str, rows: Sequence[Any]) -> Dict[str, Any]:
+    """Build the /tags/{id}/projects or /people/{id}/projects response"""
+    return {
+        "id": dimension_id,
+        "name": dimension_name,
+        "projects": [{"id": row.id, "title": row.title, "status": row.status} for row in rows]
+    }
@@ -0,0 +1,27 @@
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import SessionLocal
+from utils.project_export import EXPORT_PAGE_SIZE, stream_projects_export
+from utils.project_serializer import parse_fields
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export active projects as NDJSON")
+    parser.add_argument("path", nargs="?", help="Output file (.gz to compress); stdout if omitted")
+    parser.add_argument("--fields", default=None, help="Comma separated projection, as for GET /projects")
+    parser.add_argument("--page-size", type=int, default=EXPORT_PAGE_SIZE)
+    args = parser.parse_args()
+
+    field_names = parse_fields(args.fields)
+    compress = bool(args.path and args.path.endswith(".gz"))
+    chunks = stream_projects_export(SessionLocal, field_names, compress=compress, page_size=args.page_size)
+    if args.path:
+        with open(args.path, "wb") as output:
+            for chunk in chunks:
+                output.write(chunk)
+        print(f"Exported projects to {args.path}")
+    else:
+        for chunk in chunks:
+            sys.stdout.buffer.write(chunk)
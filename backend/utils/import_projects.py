@@ -0,0 +1,33 @@
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import SessionLocal, get_settings
+import audit_logging
+from utils.bulk_import import DEFAULT_CHUNK_SIZE, import_projects, iter_project_records
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import (upsert) projects from a JSON or JSON-lines file")
+    parser.add_argument("path", help="JSON array or .jsonl/.ndjson file in the mockProjects.json format")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Projects per transaction (keep it below SQL Server's 2100 parameter limit)")
+    args = parser.parse_args()
+
+    audit_logging.setup_audit_logging(get_settings().AUDIT_SNAPSHOT_MODE)
+    db = SessionLocal()
+    try:
+        stats = import_projects(db, iter_project_records(args.path), chunk_size=args.chunk_size)
+        print(
+            f"Imported {stats['projects_read']} projects in {stats['seconds']}s "
+            f"({stats['projects_per_second']} projects/s): "
+            f"{stats.get('projects_inserted', 0)} inserted, {stats.get('projects_updated', 0)} updated, "
+            f"children {stats.get('children_inserted', 0)} inserted / "
+            f"{stats.get('children_updated', 0)} updated / {stats.get('children_removed', 0)} removed"
+        )
+        if stats["rejected"]:
+            print(f"Skipped {len(stats['rejected'])} invalid records:")
+            for message in stats["rejected"]:
+                print(f"  {message}")
+    finally:
+        db.close()
@@ -0,0 +1,22 @@
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import get_engine
+from utils.migrations import get_head_version, migrate
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations to the registry schema")
+    parser.add_argument("--dry-run", action="store_true", help="Show the plan without changing anything")
+    parser.add_argument("--target", type=int, default=None, help="Stop after this version")
+    args = parser.parse_args()
+
+    plan = migrate(get_engine(), dry_run=args.dry_run, target=args.target)
+    if not plan:
+        print(f"Schema is up to date (migration {get_head_version()}).")
+    for migration, steps in plan:
+        verb = "Would apply" if args.dry_run else "Applied"
+        print(f"{verb} migration {migration.version}: {migration.name}")
+        for step in steps:
+            print(f"  - {step}")
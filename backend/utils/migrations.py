@@ -0,0 +1,520 @@
+import logging
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Callable, Iterator, Optional, Set, Tuple
+from sqlalchemy import (
+    JSON, Boolean, Column, DateTime, ForeignKey, Integer, MetaData, String, Table, Text,
+    cast, delete, exists, func, inspect, insert, literal, select, text, update
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.schema import CreateColumn, CreateIndex as CreateIndexDDL, Index
+import models
+from utils.timeline_dates import backfill_date_values
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_NAME = "registry"
+
+# Versions applied to this database, kept next to the tables they describe
+migration_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    migration_metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+    schema=SCHEMA_NAME,
+)
+
+# The tables as migration 1 shipped them, frozen here so that later model changes
+# (new columns, tables and indexes) stay with the migrations that introduce them
+baseline_metadata = MetaData()
+
+
+def _baseline_audit_columns() -> List[Column]:
+    return [
+        Column("created_at", DateTime, nullable=False),
+        Column("updated_at", DateTime, nullable=False),
+        Column("created_by", String(100), nullable=True),
+        Column("updated_by", String(100), nullable=True),
+        Column("is_active", Boolean, nullable=False),
+    ]
+
+
+BASELINE_TABLES = [
+    Table(
+        "projects", baseline_metadata,
+        Column("id", String(models.GUID_LENGTH), primary_key=True),
+        Column("title", String(255), nullable=False),
+        Column("description", Text, nullable=False),
+        Column("status", String(50), nullable=False),
+        Column("why_we_built_this", Text),
+        Column("what_weve_built", Text),
+        Column("nti_status", String(50)),
+        Column("nti_link", String(2083)),
+        Column("primary_benefits_category", String(100)),
+        Column("primary_ai_benefit_category", String(100)),
+        Column("investment_required", String(100)),
+        Column("expected_near_term_benefits", String(255)),
+        Column("expected_long_term_benefits", String(255)),
+        Column("primary_business_function", String(100)),
+        *_baseline_audit_columns(),
+        schema=SCHEMA_NAME,
+    ),
+    Table(
+        "timeline_items", baseline_metadata,
+        Column("id", Integer, primary_key=True, autoincrement=True),
+        Column("project_id", String(models.GUID_LENGTH), ForeignKey("registry.projects.id"), nullable=False),
+        Column("title", String(255), nullable=False),
+        Column("description", Text, nullable=False),
+        Column("date", String(50), nullable=False),
+        Column("is_step_active", Boolean),
+        *_baseline_audit_columns(),
+        schema=SCHEMA_NAME,
+    ),
+    Table(
+        "project_tags", baseline_metadata,
+        Column("id", Integer, primary_key=True, autoincrement=True),
+        Column("project_id", String(models.GUID_LENGTH), ForeignKey("registry.projects.id"), nullable=False),
+        Column("tag", String(50), nullable=False),
+        *_baseline_audit_columns(),
+        schema=SCHEMA_NAME,
+    ),
+    Table(
+        "project_individuals", baseline_metadata,
+        Column("id", Integer, primary_key=True, autoincrement=True),
+        Column("project_id", String(models.GUID_LENGTH), ForeignKey("registry.projects.id"), nullable=False),
+        Column("name", String(100), nullable=False),
+        *_baseline_audit_columns(),
+        schema=SCHEMA_NAME,
+    ),
+    Table(
+        "audit_log", baseline_metadata,
+        Column("id", Integer, primary_key=True, autoincrement=True),
+        Column("table_name", String(100), nullable=False),
+        Column("row_id", String(models.GUID_LENGTH), nullable=False),
+        Column("action", String(10), nullable=False),
+        Column("old_data", JSON, nullable=True),
+        Column("new_data", JSON, nullable=True),
+        Column("timestamp", DateTime, nullable=False),
+        Column("actor", String(100), nullable=False),
+        Column("context", String(255), nullable=True),
+        schema=SCHEMA_NAME,
+    ),
+    Table(
+        "analytics_counters", baseline_metadata,
+        Column("dimension", String(50), primary_key=True),
+        Column("value", String(100), primary_key=True),
+        Column("count", Integer, nullable=False),
+        schema=SCHEMA_NAME,
+    ),
+    Table(
+        "project_milestone_summary", baseline_metadata,
+        Column("project_id", String(models.GUID_LENGTH), ForeignKey("registry.projects.id"), primary_key=True),
+        Column("project_title", String(255), nullable=False),
+        Column("status", String(50), nullable=False),
+        Column("total_milestones", Integer, nullable=False),
+        Column("active_milestones", Integer, nullable=False),
+        schema=SCHEMA_NAME,
+    ),
+]
+
+# CREATE SCHEMA has to be alone in its batch, hence sp_executesql
+CREATE_SCHEMA_SQL = """
+    IF SCHEMA_ID(:schema_name) IS NULL
+    BEGIN
+        DECLARE @create_schema NVARCHAR(300) = N'CREATE SCHEMA ' + QUOTENAME(:schema_name);
+        EXEC sp_executesql @create_schema;
+    END
+"""
+
+# Application lock serializing concurrent migration runs
+MIGRATION_LOCK_RESOURCE = "registry.schema_migrations"
+MIGRATION_LOCK_TIMEOUT_MS = 10 * 60 * 1000
+
+# SERVERPROPERTY('EngineEdition'): Enterprise/Developer, Azure SQL Database, Managed Instance
+ONLINE_INDEX_EDITIONS = {3, 5, 8}
+
+
+class MigrationStep(ABC):
+    """One idempotent schema change: skipped when is_applied reports it is already in place"""
+
+    description = ""
+
+    def is_applied(self, conn: Connection) -> bool:
+        return False
+
+    @abstractmethod
+    def apply(self, conn: Connection) -> None:
+        """Make the change, in the caller's transaction"""
+
+
+class CreateSchema(MigrationStep):
+    def __init__(self, schema_name: str):
+        self.schema_name = schema_name
+        self.description = f"create schema {schema_name}"
+
+    def is_applied(self, conn: Connection) -> bool:
+        return self.schema_name in inspect(conn).get_schema_names()
+
+    def apply(self, conn: Connection) -> None:
+        conn.execute(text(CREATE_SCHEMA_SQL), {"schema_name": self.schema_name})
+
+
+class CreateTable(MigrationStep):
+    """Create a table (with its declared indexes) if it is missing"""
+
+    def __init__(self, table: Table):
+        self.table = table
+        self.description = f"create table {table.fullname}"
+
+    def is_applied(self, conn: Connection) -> bool:
+        return inspect(conn).has_table(self.table.name, schema=self.table.schema)
+
+    def apply(self, conn: Connection) -> None:
+        self.table.create(conn)
+
+
+class AddColumn(MigrationStep):
+    """Add a declared column to an existing table (it must be nullable or have a server default)"""
+
+    def __init__(self, table: Table, column_name: str):
+        self.table = table
+        self.column = table.c[column_name]
+        self.description = f"add column {table.fullname}.{column_name}"
+
+    def is_applied(self, conn: Connection) -> bool:
+        inspector = inspect(conn)
+        if not inspector.has_table(self.table.name, schema=self.table.schema):
+            return False
+        columns = inspector.get_columns(self.table.name, schema=self.table.schema)
+        return any(column["name"] == self.column.name for column in columns)
+
+    def apply(self, conn: Connection) -> None:
+        preparer = conn.dialect.identifier_preparer
+        ddl_compiler = conn.dialect.ddl_compiler(conn.dialect, None)
+        column_ddl = str(CreateColumn(self.column).compile(dialect=conn.dialect))
+        # A column-level REFERENCES clause adds the foreign key in the same statement
+        for foreign_key in self.column.foreign_keys:
+            remote_table = ddl_compiler.define_constraint_remote_table(
+                foreign_key.constraint, foreign_key.column.table, preparer
+            )
+            column_ddl += f" REFERENCES {remote_table} ({preparer.quote(foreign_key.column.name)})"
+        table_name = preparer.format_table(self.table)
+        conn.execute(text(f"ALTER TABLE {table_name} ADD {column_ddl}"))
+
+
+class CreateIndex(MigrationStep):
+    """
+    Create an index if it is missing, as an online build where the
+    SQL Server edition supports it so the table stays readable and writable.
+    """
+
+    def __init__(self, index: Index, online: bool = True):
+        self.index = index
+        self.online = online
+        self.description = f"create index {index.name} on {index.table.fullname}"
+
+    def is_applied(self, conn: Connection) -> bool:
+        table = self.index.table
+        inspector = inspect(conn)
+        if not inspector.has_table(table.name, schema=table.schema):
+            return False
+        indexes = inspector.get_indexes(table.name, schema=table.schema)
+        return any(index["name"] == self.index.name for index in indexes)
+
+    def apply(self, conn: Connection) -> None:
+        ddl = str(CreateIndexDDL(self.index).compile(dialect=conn.dialect))
+        if self.online and supports_online_index_builds(conn):
+            ddl += " WITH (ONLINE = ON)"
+        conn.execute(text(ddl))
+
+
+class RunPython(MigrationStep):
+    """Data migration or other custom step; `check` (if given) tells whether it is already done"""
+
+    def __init__(
+        self,
+        description: str,
+        function: Callable[[Connection], None],
+        check: Optional[Callable[[Connection], bool]] = None
+    ):
+        self.description = description
+        self.function = function
+        self.check = check
+
+    def is_applied(self, conn: Connection) -> bool:
+        return self.check(conn) if self.check is not None else False
+
+    def apply(self, conn: Connection) -> None:
+        self.function(conn)
+
+
+class Migration:
+    def __init__(self, version: int, name: str, steps: List[MigrationStep]):
+        self.version = version
+        self.name = name
+        self.steps = steps
+
+
+def supports_online_index_builds(conn: Connection) -> bool:
+    """Check whether the server can build indexes with ONLINE = ON"""
+    if conn.dialect.name != "mssql":
+        return False
+    edition = conn.execute(text("SELECT CAST(SERVERPROPERTY('EngineEdition') AS INT)")).scalar()
+    return edition in ONLINE_INDEX_EDITIONS
+
+
+def _index(table_name: str, name: str, *column_names: str) -> Index:
+    """
+    Spell out an index as a migration shipped it, on a stand-in table of its own
+    (so later changes to the models' indexes never alter a shipped version)
+    """
+    table = Table(table_name, MetaData(), *[Column(column_name) for column_name in column_names], schema=SCHEMA_NAME)
+    return Index(name, *[table.c[column_name] for column_name in column_names])
+
+
+def _backfill_dimension(dimension: Table, link: Table, id_column: str, name_column: str) -> Callable[[Connection], None]:
+    """
+    Set-based backfill of a dimension table from the names on its link table:
+    one INSERT ... SELECT DISTINCT of the new names, one UPDATE of the link ids.
+    """
+    def backfill(conn: Connection) -> None:
+        link_name = link.c[name_column]
+        conn.execute(insert(dimension).from_select(
+            ["name", "created_at"],
+            select(link_name, literal(datetime.utcnow(), DateTime)).distinct().where(
+                ~exists().where(dimension.c.name == link_name)
+            )
+        ))
+        conn.execute(
+            update(link)
+            .where(link.c[id_column].is_(None))
+            .values({id_column: select(dimension.c.id).where(dimension.c.name == link_name).scalar_subquery()})
+        )
+    return backfill
+
+
+def _dimension_backfilled(link: Table, id_column: str) -> Callable[[Connection], bool]:
+    def check(conn: Connection) -> bool:
+        # On a dry run the column may not have been added yet
+        if not AddColumn(link, id_column).is_applied(conn):
+            return False
+        return conn.execute(select(link.c.id).where(link.c[id_column].is_(None)).limit(1)).first() is None
+    return check
+
+
+def _rekey_tag_counters(conn: Connection) -> None:
+    """
+    Replace the analytics tag counters, keyed on tag text until now, with counters
+    keyed on tag_id: one DELETE and one grouped INSERT ... SELECT. Left alone when
+    the snapshot holds no tag counters (it is then rebuilt before being enabled).
+    """
+    counters = models.AnalyticsCounter.__table__
+    tag_counters = counters.c.dimension == "tag"
+    if conn.execute(select(counters.c.value).where(tag_counters).limit(1)).first() is None:
+        return
+    project_tags = models.ProjectTag.__table__
+    projects = models.Project.__table__
+    conn.execute(delete(counters).where(tag_counters))
+    conn.execute(insert(counters).from_select(
+        ["dimension", "value", "count"],
+        select(
+            literal("tag", String(50)),
+            cast(project_tags.c.tag_id, String(100)),
+            func.count(func.distinct(project_tags.c.project_id))
+        ).select_from(
+            project_tags.join(projects, projects.c.id == project_tags.c.project_id)
+        ).where(
+            project_tags.c.is_active == True,
+            projects.c.is_active == True
+        ).group_by(project_tags.c.tag_id)
+    ))
+
+
+def _tag_counters_rekeyed(conn: Connection) -> bool:
+    counters = models.AnalyticsCounter.__table__
+    tags = models.Tag.__table__
+    # On a dry run the tables may not have been created yet
+    if not all(CreateTable(table).is_applied(conn) for table in (counters, tags)):
+        return False
+    text_keyed = select(counters.c.value).where(
+        counters.c.dimension == "tag",
+        ~exists().where(cast(tags.c.id, String(100)) == counters.c.value)
+    ).limit(1)
+    return conn.execute(text_keyed).first() is None
+
+
+# Ordered schema history. Append new versions; never edit one that has shipped.
+MIGRATIONS: List[Migration] = [
+    Migration(1, "baseline tables", [
+        CreateSchema(SCHEMA_NAME),
+        *[CreateTable(table) for table in BASELINE_TABLES],
+    ]),
+    Migration(2, "indexes for the read, analytics and audit queries", [
+        CreateIndex(_index("projects", "ix_projects_updated_at", "updated_at")),
+        CreateIndex(_index("projects", "ix_projects_is_active_status", "is_active", "status")),
+        CreateIndex(_index("projects", "ix_projects_is_active_business_function", "is_active", "primary_business_function")),
+        CreateIndex(_index("projects", "ix_projects_is_active_benefits_category", "is_active", "primary_benefits_category")),
+        CreateIndex(_index("projects", "ix_projects_is_active_ai_benefit_category", "is_active", "primary_ai_benefit_category")),
+        CreateIndex(_index("timeline_items", "ix_timeline_items_project_id_is_active", "project_id", "is_active")),
+        CreateIndex(_index("project_tags", "ix_project_tags_project_id_is_active", "project_id", "is_active")),
+        CreateIndex(_index("project_individuals", "ix_project_individuals_project_id_is_active", "project_id", "is_active")),
+        CreateIndex(_index("audit_log", "ix_audit_log_timestamp", "timestamp")),
+        CreateIndex(_index("audit_log", "ix_audit_log_table_name_row_id", "table_name", "row_id")),
+        CreateIndex(_index("audit_log", "ix_audit_log_table_name_timestamp", "table_name", "timestamp")),
+        CreateIndex(_index("audit_log", "ix_audit_log_actor_timestamp", "actor", "timestamp")),
+        CreateIndex(_index("audit_log", "ix_audit_log_action_timestamp", "action", "timestamp")),
+        CreateIndex(_index("audit_log", "ix_audit_log_context_timestamp", "context", "timestamp")),
+    ]),
+    Migration(3, "tag and person dimension tables", [
+        CreateTable(models.Tag.__table__),
+        CreateTable(models.Person.__table__),
+        AddColumn(models.ProjectTag.__table__, "tag_id"),
+        AddColumn(models.ProjectIndividual.__table__, "person_id"),
+        RunPython(
+            "backfill project_tags.tag_id",
+            _backfill_dimension(models.Tag.__table__, models.ProjectTag.__table__, "tag_id", "tag"),
+            _dimension_backfilled(models.ProjectTag.__table__, "tag_id")
+        ),
+        RunPython(
+            "backfill project_individuals.person_id",
+            _backfill_dimension(models.Person.__table__, models.ProjectIndividual.__table__, "person_id", "name"),
+            _dimension_backfilled(models.ProjectIndividual.__table__, "person_id")
+        ),
+        CreateIndex(_index(
+            "project_tags", "ix_project_tags_tag_id_is_active", "tag_id", "is_active", "project_id"
+        )),
+        CreateIndex(_index(
+            "project_individuals", "ix_project_individuals_person_id_is_active", "person_id", "is_active", "project_id"
+        )),
+    ]),
+    Migration(4, "parsed timeline dates", [
+        AddColumn(models.TimelineItem.__table__, "date_value"),
+        RunPython("backfill timeline_items.date_value", backfill_date_values),
+        CreateIndex(_index("timeline_items", "ix_timeline_items_is_active_date_value", "is_active", "date_value")),
+    ]),
+    Migration(5, "analytics tag counters keyed on tag id", [
+        RunPython("re-key the analytics tag counters", _rekey_tag_counters, _tag_counters_rekeyed),
+    ]),
+    Migration(6, "audit row id index", [
+        CreateIndex(_index("audit_log", "ix_audit_log_row_id_timestamp", "row_id", "timestamp")),
+    ]),
+]
+
+
+@contextmanager
+def migration_lock(engine: Engine, enabled: bool = True) -> Iterator[None]:
+    """
+    Serialize migration runs across processes (e.g. several workers starting at
+    once) with a SQL Server application lock held for the duration.
+    
+    Raises:
+        RuntimeError: If the lock isn't granted within MIGRATION_LOCK_TIMEOUT_MS
+    """
+    if not enabled or engine.dialect.name != "mssql":
+        yield
+        return
+    
+    with engine.connect() as conn:
+        result = conn.execute(text("""
+            DECLARE @result INT;
+            EXEC @result = sp_getapplock @Resource = :resource, @LockMode = 'Exclusive',
+                @LockOwner = 'Session', @LockTimeout = :timeout;
+            SELECT @result;
+        """), {"resource": MIGRATION_LOCK_RESOURCE, "timeout": MIGRATION_LOCK_TIMEOUT_MS}).scalar()
+        conn.commit()
+        if result is None or result < 0:
+            raise RuntimeError(f"Could not acquire the migration lock (sp_getapplock returned {result})")
+        try:
+            yield
+        finally:
+            # Session-owned locks outlive transactions, and pooled connections stay open
+            conn.execute(text(
+                "EXEC sp_releaseapplock @Resource = :resource, @LockOwner = 'Session'"
+            ), {"resource": MIGRATION_LOCK_RESOURCE})
+            conn.commit()
+
+
+def get_head_version() -> int:
+    """Latest migration version defined in code"""
+    return max(migration.version for migration in MIGRATIONS)
+
+
+def get_current_version(conn: Connection) -> Optional[int]:
+    """Highest version recorded in registry.schema_migrations (None if there is none), in one query"""
+    try:
+        return conn.execute(select(func.max(schema_migrations.c.version))).scalar()
+    except DBAPIError:
+        # No migration history (e.g. an empty or wiped database)
+        return None
+
+
+def get_applied_versions(conn: Connection) -> Set[int]:
+    """Versions recorded in registry.schema_migrations (empty if it doesn't exist yet)"""
+    if not inspect(conn).has_table(schema_migrations.name, schema=schema_migrations.schema):
+        return set()
+    return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def migrate(
+    engine: Engine,
+    dry_run: bool = False,
+    target: Optional[int] = None
+) -> List[Tuple[Migration, List[str]]]:
+    """
+    Apply the pending migrations in version order.
+
+    Every step runs in its own short transaction and is skipped if already in
+    place, so an interrupted run can simply be repeated; a version is recorded
+    once all of its steps succeeded.
+
+    Args:
+        engine: SQLAlchemy engine instance
+        dry_run: Only report what would run
+        target: Stop after this version (default: the head)
+
+    Returns:
+        The pending migrations with a description of each of their steps
+    """
+    with migration_lock(engine, enabled=not dry_run):
+        return _run_pending(engine, dry_run, target)
+
+
+def _run_pending(
+    engine: Engine,
+    dry_run: bool,
+    target: Optional[int]
+) -> List[Tuple[Migration, List[str]]]:
+    with engine.connect() as conn:
+        applied = get_applied_versions(conn)
+    pending = [
+        migration for migration in sorted(MIGRATIONS, key=lambda migration: migration.version)
+        if migration.version not in applied and (target is None or migration.version <= target)
+    ]
+
+    plan = []
+    for migration in pending:
+        descriptions = []
+        for step in migration.steps:
+            with engine.begin() as conn:
+                if step.is_applied(conn):
+                    descriptions.append(f"{step.description} (already in place)")
+                    continue
+                descriptions.append(step.description)
+                if not dry_run:
+                    logger.info(f"Migration {migration.version}: {step.description}")
+                    step.apply(conn)
+        if not dry_run:
+            with engine.begin() as conn:
+                schema_migrations.create(conn, checkfirst=True)
+                conn.execute(insert(schema_migrations).values(
+                    version=migration.version,
+                    name=migration.name,
+                    applied_at=datetime.utcnow()
+                ))
+            logger.info(f"Applied migration {migration.version} ({migration.name})")
+        plan.append((migration, descriptions))
+    return plan
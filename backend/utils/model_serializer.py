@@ -0,0 +1,94 @@
+import json
+from operator import attrgetter, itemgetter
+from typing import Dict, Any, Callable, Optional, Tuple, Type
+from sqlalchemy import Date, DateTime, Time
+from sqlalchemy.inspection import inspect
+
+# Shared encoder for JSON columns and audit snapshots: compact separators and no
+# circular-reference bookkeeping (snapshots are flat dicts), reused across calls
+_snapshot_encoder = json.JSONEncoder(separators=(",", ":"), check_circular=False)
+
+
+def encode_json(value: Any) -> str:
+    """Encode a JSON-compatible value (e.g. an audit snapshot) with the shared encoder"""
+    return _snapshot_encoder.encode(value)
+
+
+def _tuple_getter(keys: Tuple[str, ...]) -> Callable[[Any], Tuple[Any, ...]]:
+    """
+    Getter for several attributes that always returns a tuple.
+    
+    Loaded column values live in the instance __dict__, so they are read with one
+    compiled itemgetter; if any is missing (expired or deferred) the instrumented
+    attributes are used instead, which loads them.
+    """
+    read_loaded = itemgetter(*keys)
+    read_attributes = attrgetter(*keys)
+    single = len(keys) == 1
+    
+    def get(obj: Any) -> Tuple[Any, ...]:
+        try:
+            values = read_loaded(obj.__dict__)
+        except KeyError:
+            values = read_attributes(obj)
+        return (values,) if single else values
+    return get
+
+
+def _isoformat(value: Any) -> Any:
+    return value.isoformat() if value is not None else None
+
+
+class ModelSerializer:
+    """
+    Column metadata of one mapped class, computed once: the column keys, a
+    compiled attrgetter for all of them, the primary key getter and the
+    converters for columns whose values are not JSON native.
+    """
+
+    __slots__ = ("keys", "_get_values", "_get_primary_key", "_converters")
+
+    def __init__(self, model_class: Type[Any]):
+        mapper = inspect(model_class)
+        self.keys = tuple(column.key for column in mapper.columns)
+        self._get_values = _tuple_getter(self.keys)
+        self._get_primary_key = _tuple_getter(tuple(
+            mapper.get_property_by_column(column).key for column in mapper.primary_key
+        ))
+        self._converters = tuple(
+            (index, _isoformat)
+            for index, column in enumerate(mapper.columns)
+            if isinstance(column.type, (DateTime, Date, Time))
+        )
+
+    def serialize(self, obj: Any) -> Dict[str, Any]:
+        """Snapshot an instance's column values as a JSON-compatible dict"""
+        values = self._get_values(obj)
+        if self._converters:
+            values = list(values)
+            for index, convert in self._converters:
+                values[index] = convert(values[index])
+        return dict(zip(self.keys, values))
+
+    def primary_key(self, obj: Any) -> str:
+        """Get the primary key as a string ("|"-joined for composite keys)"""
+        return "|".join(str(value) for value in self._get_primary_key(obj))
+
+
+_serializers: Dict[Type[Any], ModelSerializer] = {}
+
+
+def get_model_serializer(model_class: Type[Any]) -> ModelSerializer:
+    """Get (building on first use) the serializer of a mapped class"""
+    serializer = _serializers.get(model_class)
+    if serializer is None:
+        serializer = ModelSerializer(model_class)
+        _serializers[model_class] = serializer
+    return serializer
+
+
+def serialize_instance(obj: Optional[Any]) -> Optional[Dict[str, Any]]:
+    """Snapshot any mapped instance through its cached serializer"""
+    if obj is None:
+        return None
+    return get_model_serializer(type(obj)).serialize(obj)
@@ -0,0 +1,75 @@
+import json
+import zlib
+from typing import List, Iterable, Iterator
+from sqlalchemy.orm import Session, sessionmaker
+from utils.project_serializer import (
+    PROJECT_API_FIELDS,
+    build_project_listing_statement,
+    split_page,
+    project_to_api_dict
+)
+
+EXPORT_PAGE_SIZE = 200
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# zlib window bits for a gzip container (header and CRC trailer)
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def iter_ndjson_pages(
+    db: Session,
+    field_names: List[str] = PROJECT_API_FIELDS,
+    page_size: int = EXPORT_PAGE_SIZE
+) -> Iterator[bytes]:
+    """
+    Yield active projects as NDJSON, one encoded page of lines at a time.
+
+    Pages are keyset queries on the project id (one SELECT for the projects and
+    one per child relationship), and the session is cleared after each page, so
+    memory use depends on the page size rather than the registry size.
+
+    Args:
+        db: SQLAlchemy session
+        field_names: Projection from parse_fields
+        page_size: Projects per query
+    """
+    cursor = None
+    while True:
+        statement = build_project_listing_statement(field_names, cursor, page_size)
+        projects, cursor = split_page(db.execute(statement).scalars().all(), page_size)
+        if projects:
+            yield "".join(
+                json.dumps(project_to_api_dict(project, field_names)) + "\n"
+                for project in projects
+            ).encode("utf-8")
+        db.expunge_all()
+        if cursor is None:
+            return
+
+
+def gzip_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Gzip a stream of byte chunks incrementally"""
+    compressor = zlib.compressobj(wbits=GZIP_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def stream_projects_export(
+    session_factory: sessionmaker,
+    field_names: List[str] = PROJECT_API_FIELDS,
+    compress: bool = False,
+    page_size: int = EXPORT_PAGE_SIZE
+) -> Iterator[bytes]:
+    """
+    Stream the registry export with a session owned by the stream itself, so it
+    stays open for as long as the response body is being sent.
+    """
+    db = session_factory()
+    try:
+        chunks = iter_ndjson_pages(db, field_names, page_size)
+        yield from gzip_stream(chunks) if compress else chunks
+    finally:
+        db.close()
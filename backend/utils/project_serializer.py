@@ -0,0 +1,151 @@
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import load_only
+from sqlalchemy.sql import Select
+import models
+from utils.audit_utils import get_active_only_filter, get_active_children_options
+
+# Keyset pagination for the project listing
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Frontend field name -> Project column, in the order the frontend expects them
+PROJECT_COLUMN_FIELDS: Dict[str, str] = {
+    "id": "id",
+    "title": "title",
+    "description": "description",
+    "status": "status",
+    "whyWeBuiltThis": "why_we_built_this",
+    "whatWeveBuilt": "what_weve_built",
+    "ntiStatus": "nti_status",
+    "ntiLink": "nti_link",
+    "primaryBenefitsCategory": "primary_benefits_category",
+    "primaryAIBenefitCategory": "primary_ai_benefit_category",
+    "investmentRequired": "investment_required",
+    "expectedNearTermBenefits": "expected_near_term_benefits",
+    "expectedLongTermBenefits": "expected_long_term_benefits",
+    "primaryBusinessFunction": "primary_business_function",
+}
+
+# Frontend field name -> Project relationship
+PROJECT_RELATIONSHIP_FIELDS: Dict[str, str] = {
+    "tags": "tags",
+    "individualsInvolved": "individuals",
+    "timeline": "timeline",
+}
+
+# Full frontend field order
+PROJECT_API_FIELDS: List[str] = [
+    "id", "title", "description", "status", "tags", "whyWeBuiltThis", "whatWeveBuilt",
+    "individualsInvolved", "timeline", "ntiStatus", "ntiLink", "primaryBenefitsCategory",
+    "primaryAIBenefitCategory", "investmentRequired", "expectedNearTermBenefits",
+    "expectedLongTermBenefits", "primaryBusinessFunction",
+]
+
+# Required columns are returned as-is, optional ones default to "" for the frontend
+REQUIRED_FIELDS = {"id", "title", "description", "status"}
+
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """
+    Parse a comma separated `fields=` projection into frontend field names.
+    
+    Args:
+        fields: Comma separated field names, or None for every field
+        
+    Returns:
+        Requested field names in frontend order, always including "id"
+        
+    Raises:
+        ValueError: If an unknown field name is requested
+    """
+    if not fields:
+        return list(PROJECT_API_FIELDS)
+    
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - set(PROJECT_API_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    
+    requested.add("id")
+    return [field for field in PROJECT_API_FIELDS if field in requested]
+
+
+def get_projection_options(field_names: List[str]) -> List[Any]:
+    """Get loader options that SELECT only the columns and children behind the requested fields"""
+    columns = [
+        getattr(models.Project, PROJECT_COLUMN_FIELDS[field])
+        for field in field_names if field in PROJECT_COLUMN_FIELDS
+    ]
+    relationships = [
+        PROJECT_RELATIONSHIP_FIELDS[field]
+        for field in field_names if field in PROJECT_RELATIONSHIP_FIELDS
+    ]
+    return [load_only(*columns)] + get_active_children_options(relationships)
+
+
+def build_project_listing_statement(
+    field_names: List[str],
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None
+) -> Select:
+    """
+    Build the keyset-paginated listing of active projects, ordered by primary key.
+    
+    Args:
+        field_names: Projection from parse_fields
+        cursor: Last project id of the previous page
+        limit: Page size; one extra row is fetched to detect a following page
+    """
+    statement = select(models.Project).options(
+        *get_projection_options(field_names)
+    ).where(get_active_only_filter(models.Project))
+    if cursor is not None:
+        statement = statement.where(models.Project.id > cursor)
+    statement = statement.order_by(models.Project.id)
+    if limit is not None:
+        statement = statement.limit(limit + 1)
+    return statement
+
+
+def split_page(projects: Sequence[models.Project], limit: Optional[int]) -> Tuple[Sequence[models.Project], Optional[str]]:
+    """Trim the extra row fetched by build_project_listing_statement and derive the next cursor"""
+    if limit is None or len(projects) <= limit:
+        return projects, None
+    projects = projects[:limit]
+    return projects, projects[-1].id
+
+
+def build_project_detail_statement(project_id: str) -> Select:
+    """Build the load of one active project with its active children"""
+    return select(models.Project).options(
+        *get_active_children_options()
+    ).where(
+        models.Project.id == project_id,
+        get_active_only_filter(models.Project)
+    )
+
+
+def project_to_api_dict(project: models.Project, field_names: List[str] = PROJECT_API_FIELDS) -> Dict[str, Any]:
+    """Transform a project to match the frontend format, keeping only the requested fields"""
+    project_dict = {}
+    for field in field_names:
+        if field == "tags":
+            project_dict[field] = [tag.tag for tag in project.tags]
+        elif field == "individualsInvolved":
+            project_dict[field] = [individual.name for individual in project.individuals]
+        elif field == "timeline":
+            project_dict[field] = [
+                {
+                    "title": item.title,
+                    "description": item.description,
+                    "date": item.date,
+                    "isStepActive": item.is_step_active
+                }
+                for item in project.timeline
+            ]
+        elif field in REQUIRED_FIELDS:
+            project_dict[field] = getattr(project, PROJECT_COLUMN_FIELDS[field])
+        else:
+            project_dict[field] = getattr(project, PROJECT_COLUMN_FIELDS[field]) or ""
+    return project_dict
@@ -0,0 +1,15 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import SessionLocal
+from utils.analytics_snapshot import rebuild_analytics_snapshot
+
+if __name__ == "__main__":
+    print("Rebuilding analytics snapshot from the project tables...")
+    db = SessionLocal()
+    try:
+        project_count = rebuild_analytics_snapshot(db)
+        print(f"Analytics snapshot rebuilt for {project_count} active projects.")
+    finally:
+        db.close()
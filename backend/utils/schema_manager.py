@@ -1,59 +1,14 @@
 from sqlalchemy import text, inspect
-from sqlalchemy.orm import Session
 from sqlalchemy.engine import Engine
+from typing import Optional
+import json
 import logging
+import os
+from utils.migrations import get_current_version, get_head_version, migrate
 
 logger = logging.getLogger(__name__)
 
-def schema_exists(engine: Engine, schema_name: str) -> bool:
-    """
-    Check if a specific schema exists in the connected database.
-    
-    Args:
-        engine: SQLAlchemy engine instance
-        schema_name: Name of the schema to check
-    
-    Returns:
-        bool: True if schema exists, False otherwise
-    """
-    try:
-        inspector = inspect(engine)
-        # For SQL Server, get schema names
-        with engine.connect() as conn:
-            result = conn.execute(text("""
-                SELECT SCHEMA_NAME 
-                FROM INFORMATION_SCHEMA.SCHEMATA 
-                WHERE SCHEMA_NAME = :schema_name
-            """), {"schema_name": schema_name})
-            return result.fetchone() is not None
-    except Exception as e:
-        logger.error(f"Error checking if schema '{schema_name}' exists: {e}")
-        return False
-
-def create_schema_if_not_exists(engine: Engine, schema_name: str) -> bool:
-    """
-    Create a schema if it doesn't exist.
-    
-    Args:
-        engine: SQLAlchemy engine instance
-        schema_name: Name of the schema to create
-    
-    Returns:
-        bool: True if schema was created or already exists, False if creation failed
-    """
-    try:
-        if schema_exists(engine, schema_name):
-            logger.info(f"Schema '{schema_name}' already exists")
-            return True
-        
-        with engine.connect() as conn:
-            conn.execute(text(f"CREATE SCHEMA [{schema_name}]"))
-            conn.commit()
-            logger.info(f"Schema '{schema_name}' created successfully")
-            return True
-    except Exception as e:
-        logger.error(f"Error creating schema '{schema_name}': {e}")
-        return False
+SCHEMA_BOOTSTRAP_MODES = ("auto", "versioned", "skip")
 
 def drop_schema_if_exists(engine: Engine, schema_name: str) -> bool:
     """
@@ -67,7 +22,7 @@ def drop_schema_if_exists(engine: Engine, schema_name: str) -> bool:
         bool: True if schema was dropped or doesn't exist, False if drop failed
     """
     try:
-        if not schema_exists(engine, schema_name):
+        if not inspect(engine).has_schema(schema_name):
             logger.info(f"Schema '{schema_name}' does not exist, nothing to drop")
             return True
         
@@ -80,22 +35,73 @@ def drop_schema_if_exists(engine: Engine, schema_name: str) -> bool:
         logger.error(f"Error dropping schema '{schema_name}': {e}")
         return False
 
-def ensure_schema_exists(engine: Engine, schema_name: str) -> bool:
+def read_schema_version(path: str, database_key: str) -> Optional[int]:
+    """Read the migration version recorded for a database by the last bootstrap, if any"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f).get(database_key)
+    except (OSError, ValueError):
+        return None
+
+
+def write_schema_version(path: str, database_key: str, version: Optional[int]) -> None:
+    """Record the migrated version for a database, or forget it if version is None (atomic replace)"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            versions = json.load(f)
+    except (OSError, ValueError):
+        versions = {}
+    if version is None:
+        if database_key not in versions:
+            return
+        del versions[database_key]
+    else:
+        versions[database_key] = version
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(versions, f)
+    os.replace(temp_path, path)
+
+
+def bootstrap_schema(
+    engine: Engine,
+    mode: str,
+    version_file: str,
+    database_key: str
+) -> bool:
     """
-    Ensure a schema exists in the database. Create it if it doesn't exist.
+    Bring the schema up to date at startup, according to SCHEMA_BOOTSTRAP_MODE.
     
     Args:
         engine: SQLAlchemy engine instance
-        schema_name: Name of the schema to ensure exists
+        mode: "auto" (apply pending migrations on every start), "versioned"
+              (only when the database's latest applied migration is not the head) or "skip"
+        version_file: Local file recording the migrated version per database
+        database_key: Identifies the database within the version file
     
     Returns:
-        bool: True if schema exists or was created successfully, False otherwise
+        bool: True if migrations were checked, False if that was skipped
+    
+    Raises:
+        ValueError: If the mode is unknown
     """
-    logger.info(f"Ensuring schema '{schema_name}' exists...")
+    if mode not in SCHEMA_BOOTSTRAP_MODES:
+        raise ValueError(f"Unknown schema bootstrap mode '{mode}'")
+    if mode == "skip":
+        logger.info("Schema bootstrap skipped")
+        return False
     
-    if schema_exists(engine, schema_name):
-        logger.info(f"Schema '{schema_name}' already exists")
-        return True
+    head_version = get_head_version()
+    if mode == "versioned" and read_schema_version(version_file, database_key) == head_version:
+        # The file can be stale (e.g. the database was wiped), so confirm with one cheap query
+        with engine.connect() as conn:
+            current_version = get_current_version(conn)
+        if current_version == head_version:
+            logger.info(f"Schema already at migration {head_version}, skipping checks")
+            return False
+        logger.info(f"Recorded migration {head_version} but the database is at {current_version}")
     
-    logger.info(f"Schema '{schema_name}' does not exist, creating...")
-    return create_schema_if_not_exists(engine, schema_name)
\ No newline at end of file
+    migrate(engine)
+    if mode == "versioned":
+        write_schema_version(version_file, database_key, head_version)
+    return True
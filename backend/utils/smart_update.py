@@ -1,9 +1,13 @@
+from datetime import datetime
 from typing import List, Dict, Any, Set, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy.inspection import inspect
 import models
 import audit_logging
-from utils.audit_utils import auto_populate_audit_fields
+from utils.audit_utils import auto_populate_audit_fields, get_current_user_id
+from utils.bulk_sync import comparable_value, get_audit_field_values, insert_rows
+from utils.dimensions import resolve_dimension_ids
+from utils.timeline_dates import parse_timeline_date
 
 
 def get_entity_key(entity: Any, key_fields: List[str]) -> str:
@@ -15,42 +19,74 @@ def get_entity_key(entity: Any, key_fields: List[str]) -> str:
     return "|".join(key_parts)
 
 
+def ordered_subset(subset: Set[Any], ordered_values: List[Any]) -> List[Any]:
+    """Keep the payload order for a subset of its (deduplicated) values"""
+    seen = set()
+    ordered = []
+    for value in ordered_values:
+        if value in subset and value not in seen:
+            seen.add(value)
+            ordered.append(value)
+    return ordered
+
+
+def insert_child_rows(db: Session, model: Any, project_id: str, rows: List[Dict[str, Any]]) -> None:
+    """
+    Insert a project's new child rows with a single INSERT ... OUTPUT/RETURNING
+    and log their audit rows from the returned IDs (no flush per row).
+    """
+    if not rows:
+        return
+    audit_values = get_audit_field_values(datetime.utcnow(), get_current_user_id(), is_update=False)
+    insert_rows(
+        db,
+        model,
+        [{"project_id": project_id, **row, **audit_values} for row in rows],
+        context="smart-update"
+    )
+
+
 def compare_and_update_project_tags(
     db: Session,
     project_id: str,
     new_tags: List[Any],
     existing_tags: List[models.ProjectTag]
-) -> None:
+) -> Tuple[bool, Dict[str, int]]:
     """
     Smart update for project tags - only change what's different
+    Tags are compared on their tag ids (new tag names are created in one INSERT)
+    Returns whether any tag was added or removed, and the tag id of each payload name
     """
-    # Create sets of tag values for comparison
-    new_tag_values = {tag.tag for tag in new_tags}
-    existing_tag_map = {tag.tag: tag for tag in existing_tags if tag.is_active}
-    existing_tag_values = set(existing_tag_map.keys())
+    # Resolve the payload's tag names to ids, keeping the first spelling of each
+    tag_ids = resolve_dimension_ids(db, models.Tag, [tag.tag for tag in new_tags])
+    new_tag_names = {}
+    for tag in new_tags:
+        new_tag_names.setdefault(tag_ids[tag.tag], tag.tag)
+    new_tag_ids = set(new_tag_names)
+    existing_tag_map = {tag.tag_id: tag for tag in existing_tags if tag.is_active}
+    existing_tag_ids = set(existing_tag_map.keys())
     
     # Find what needs to be added, removed, or kept
-    tags_to_add = new_tag_values - existing_tag_values
-    tags_to_remove = existing_tag_values - new_tag_values
-    tags_to_keep = new_tag_values & existing_tag_values
+    tags_to_add = new_tag_ids - existing_tag_ids
+    tags_to_remove = existing_tag_ids - new_tag_ids
+    tags_to_keep = new_tag_ids & existing_tag_ids
     
     # Remove tags that are no longer needed
-    for tag_value in tags_to_remove:
-        tag_to_remove = existing_tag_map[tag_value]
+    for tag_id in tags_to_remove:
+        tag_to_remove = existing_tag_map[tag_id]
         audit_logging.log_delete(db, tag_to_remove, context="smart-update")
         tag_to_remove.is_active = False
         auto_populate_audit_fields(tag_to_remove, is_update=True)
     
-    # Add new tags
-    for tag_value in tags_to_add:
-        new_tag = models.ProjectTag(project_id=project_id, tag=tag_value)
-        auto_populate_audit_fields(new_tag, is_update=False)
-        db.add(new_tag)
-        db.flush()  # Flush to get the ID for audit logging
-        audit_logging.log_insert(db, new_tag, context="smart-update")
+    # Add new tags (one INSERT, audited from the returned IDs)
+    insert_child_rows(db, models.ProjectTag, project_id, [
+        {"tag_id": tag_id, "tag": new_tag_names[tag_id]}
+        for tag_id in ordered_subset(tags_to_add, list(new_tag_names))
+    ])
     
     # Tags to keep don't need any changes
     print(f"Tags - Added: {len(tags_to_add)}, Removed: {len(tags_to_remove)}, Kept: {len(tags_to_keep)}")
+    return bool(tags_to_add or tags_to_remove), tag_ids
 
 
 def compare_and_update_project_individuals(
@@ -58,37 +94,42 @@ def compare_and_update_project_individuals(
     project_id: str,
     new_individuals: List[Any],
     existing_individuals: List[models.ProjectIndividual]
-) -> None:
+) -> bool:
     """
     Smart update for project individuals - only change what's different
+    Individuals are compared on their person ids (new names are created in one INSERT)
+    Returns True if any individual was added or removed
     """
-    # Create sets of individual names for comparison
-    new_individual_names = {individual.name for individual in new_individuals}
-    existing_individual_map = {individual.name: individual for individual in existing_individuals if individual.is_active}
-    existing_individual_names = set(existing_individual_map.keys())
+    # Resolve the payload's names to person ids, keeping the first spelling of each
+    person_ids = resolve_dimension_ids(db, models.Person, [individual.name for individual in new_individuals])
+    new_individual_names = {}
+    for individual in new_individuals:
+        new_individual_names.setdefault(person_ids[individual.name], individual.name)
+    new_person_ids = set(new_individual_names)
+    existing_individual_map = {individual.person_id: individual for individual in existing_individuals if individual.is_active}
+    existing_person_ids = set(existing_individual_map.keys())
     
     # Find what needs to be added, removed, or kept
-    individuals_to_add = new_individual_names - existing_individual_names
-    individuals_to_remove = existing_individual_names - new_individual_names
-    individuals_to_keep = new_individual_names & existing_individual_names
+    individuals_to_add = new_person_ids - existing_person_ids
+    individuals_to_remove = existing_person_ids - new_person_ids
+    individuals_to_keep = new_person_ids & existing_person_ids
     
     # Remove individuals that are no longer needed
-    for individual_name in individuals_to_remove:
-        individual_to_remove = existing_individual_map[individual_name]
+    for person_id in individuals_to_remove:
+        individual_to_remove = existing_individual_map[person_id]
         audit_logging.log_delete(db, individual_to_remove, context="smart-update")
         individual_to_remove.is_active = False
         auto_populate_audit_fields(individual_to_remove, is_update=True)
     
-    # Add new individuals
-    for individual_name in individuals_to_add:
-        new_individual = models.ProjectIndividual(project_id=project_id, name=individual_name)
-        auto_populate_audit_fields(new_individual, is_update=False)
-        db.add(new_individual)
-        db.flush()  # Flush to get the ID for audit logging
-        audit_logging.log_insert(db, new_individual, context="smart-update")
+    # Add new individuals (one INSERT, audited from the returned IDs)
+    insert_child_rows(db, models.ProjectIndividual, project_id, [
+        {"person_id": person_id, "name": new_individual_names[person_id]}
+        for person_id in ordered_subset(individuals_to_add, list(new_individual_names))
+    ])
     
     # Individuals to keep don't need any changes
     print(f"Individuals - Added: {len(individuals_to_add)}, Removed: {len(individuals_to_remove)}, Kept: {len(individuals_to_keep)}")
+    return bool(individuals_to_add or individuals_to_remove)
 
 
 def compare_and_update_timeline_items(
@@ -96,10 +137,11 @@ def compare_and_update_timeline_items(
     project_id: str,
     new_timeline_items: List[Any],
     existing_timeline_items: List[models.TimelineItem]
-) -> None:
+) -> bool:
     """
     Smart update for timeline items - only change what's different
     Timeline items are more complex as they have multiple fields that can change
+    Returns True if any timeline item was added, removed or updated
     """
     # Create maps for comparison (using title + date as unique key)
     new_timeline_map = {}
@@ -128,20 +170,17 @@ def compare_and_update_timeline_items(
         item_to_remove.is_active = False
         auto_populate_audit_fields(item_to_remove, is_update=True)
     
-    # Add new timeline items
-    for item_key in items_to_add:
-        new_item_data = new_timeline_map[item_key]
-        new_item = models.TimelineItem(
-            project_id=project_id,
-            title=new_item_data.title,
-            description=new_item_data.description,
-            date=new_item_data.date,
-            is_step_active=new_item_data.is_step_active
-        )
-        auto_populate_audit_fields(new_item, is_update=False)
-        db.add(new_item)
-        db.flush()  # Flush to get the ID for audit logging
-        audit_logging.log_insert(db, new_item, context="smart-update")
+    # Add new timeline items (one INSERT, audited from the returned IDs)
+    insert_child_rows(db, models.TimelineItem, project_id, [
+        {
+            "title": new_timeline_map[item_key].title,
+            "description": new_timeline_map[item_key].description,
+            "date": new_timeline_map[item_key].date,
+            "date_value": parse_timeline_date(new_timeline_map[item_key].date),
+            "is_step_active": new_timeline_map[item_key].is_step_active,
+        }
+        for item_key in ordered_subset(items_to_add, list(new_timeline_map))
+    ])
     
     # Check existing items for updates
     items_updated = 0
@@ -168,6 +207,7 @@ def compare_and_update_timeline_items(
             items_updated += 1
     
     print(f"Timeline - Added: {len(items_to_add)}, Removed: {len(items_to_remove)}, Updated: {items_updated}, Kept: {len(items_to_check) - items_updated}")
+    return bool(items_to_add or items_to_remove or items_updated)
 
 
 def has_project_fields_changed(db_project: models.Project, new_project_data: Any) -> bool:
@@ -186,8 +226,8 @@ def has_project_fields_changed(db_project: models.Project, new_project_data: Any
         new_value = getattr(new_project_data, field, None)
         
         # Handle None values and convert to strings for comparison
-        existing_str = str(existing_value) if existing_value is not None else ""
-        new_str = str(new_value) if new_value is not None else ""
+        existing_str = comparable_value(existing_value)
+        new_str = comparable_value(new_value)
         
         if existing_str != new_str:
             print(f"Field '{field}' changed: '{existing_str}' -> '{new_str}'")
@@ -0,0 +1,115 @@
+import re
+from datetime import date, datetime
+from typing import Dict, Any, Iterable, Optional
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.engine import Connection
+import models
+
+BACKFILL_BATCH_SIZE = 1000
+
+# strptime formats tried after the ISO fast path; month-only formats give the 1st.
+# Numeric dates with slashes or dots are read day first (15/03/2024).
+DATE_FORMATS = (
+    "%Y/%m/%d", "%Y.%m.%d", "%d/%m/%Y", "%d.%m.%Y", "%d-%m-%Y",
+    "%d %B %Y", "%d %b %Y", "%B %d, %Y", "%b %d, %Y", "%B %d %Y", "%b %d %Y",
+    "%Y-%m", "%Y/%m", "%m/%Y", "%B %Y", "%b %Y", "%b-%Y", "%B, %Y",
+)
+
+QUARTER_PATTERN = re.compile(r"^(?:Q([1-4])\s*[-/ ]?\s*(\d{4})|(\d{4})\s*[-/ ]?\s*Q([1-4]))$", re.IGNORECASE)
+YEAR_PATTERN = re.compile(r"^\d{4}$")
+# strptime's %b only knows "Sep"
+SEPT_PATTERN = re.compile(r"\bSept\b", re.IGNORECASE)
+
+
+def parse_timeline_date(value: Optional[str]) -> Optional[date]:
+    """
+    Tolerantly parse a timeline item's free-text date.
+
+    Accepts ISO dates and datetimes, common numeric and month-name formats,
+    months ("2024-03", "Mar 2024"), quarters ("Q1 2024") and bare years; partial
+    dates resolve to their first day.
+
+    Returns:
+        The date, or None if the text isn't recognised
+    """
+    if not value:
+        return None
+    text = SEPT_PATTERN.sub("Sep", " ".join(value.split())).rstrip(".")
+    if not text:
+        return None
+    try:
+        return date.fromisoformat(text[:10])
+    except ValueError:
+        pass
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    quarter = QUARTER_PATTERN.match(text)
+    if quarter:
+        number, year = (quarter.group(1), quarter.group(2)) if quarter.group(1) else (quarter.group(4), quarter.group(3))
+        return date(int(year), (int(number) - 1) * 3 + 1, 1)
+    if YEAR_PATTERN.match(text):
+        return date(int(text), 1, 1)
+    return None
+
+
+def attach_date_values(timeline_rows: Iterable[Dict[str, Any]]) -> None:
+    """Set date_value on timeline item rows from their date string"""
+    for row in timeline_rows:
+        row["date_value"] = parse_timeline_date(row["date"])
+
+
+def backfill_date_values(
+    conn: Connection,
+    batch_size: int = BACKFILL_BATCH_SIZE,
+    reparse: bool = False,
+    commit: bool = False
+) -> Dict[str, int]:
+    """
+    Populate timeline_items.date_value from the date strings.
+
+    Rows are walked in id order, one keyset batch at a time, and only changed
+    values are written (one executemany UPDATE per batch). This is derived data,
+    so updated_at and the audit log are left alone.
+
+    Args:
+        conn: Connection to run on
+        batch_size: Rows read per batch
+        reparse: Re-parse rows that already have a date_value (e.g. after parser changes)
+        commit: Commit after each batch (the caller owns the transaction otherwise)
+
+    Returns:
+        Rows scanned, updated and left without a date
+    """
+    table = models.TimelineItem.__table__
+    set_date_value = update(table).where(
+        table.c.id == bindparam("row_id")
+    ).values(date_value=bindparam("parsed_date"))
+    counts = {"scanned": 0, "updated": 0, "unparsed": 0}
+    last_id = None
+    while True:
+        statement = select(table.c.id, table.c.date, table.c.date_value).order_by(table.c.id).limit(batch_size)
+        if last_id is not None:
+            statement = statement.where(table.c.id > last_id)
+        if not reparse:
+            statement = statement.where(table.c.date_value.is_(None))
+        rows = conn.execute(statement).all()
+        if not rows:
+            return counts
+        last_id = rows[-1].id
+
+        changes = []
+        for row in rows:
+            parsed_date = parse_timeline_date(row.date)
+            if parsed_date is None:
+                counts["unparsed"] += 1
+            if parsed_date != row.date_value:
+                changes.append({"row_id": row.id, "parsed_date": parsed_date})
+        if changes:
+            conn.execute(set_date_value, changes)
+        if commit:
+            conn.commit()
+        counts["scanned"] += len(rows)
+        counts["updated"] += len(changes)